@@ -10,15 +10,103 @@ import logging
 from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
+from functools import cached_property
+from string import Template
 from typing import Dict, List, Optional
 
 import google.generativeai as genai
 from src.utils.ai_keys import get_ai_api_key
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _loads(text: str):
+    """Decode JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _strip_code_fence(text: str) -> str:
+    """Return the body of a ```json fenced block, or the stripped text if unfenced."""
+    start = text.find("```")
+    if start == -1:
+        return text.strip()
+    
+    start += 3
+    if text.startswith("json", start):
+        start += 4
+    
+    end = text.rfind("```")
+    if end < start:
+        end = len(text)
+    
+    return text[start:end].strip()
+
+
+# Parsed once at import; only the request-specific slots are filled per call
+_ANALYSIS_PROMPT = Template("""You are an expert crypto trading analyst. Analyze the following market data and provide a trading recommendation.
+
+**Asset:** ${symbol} (${tier} tier)
+**Current Price:** $$${current_price}
+
+**Market Data:**
+${market_data}
+
+**Technical Indicators:**
+${technical_indicators}
+
+**Sentiment Data:**
+${sentiment_data}
+
+**On-Chain Data:**
+${on_chain_data}
+
+**Portfolio Context:**
+${portfolio_context}
+
+**Risk Management Rules:**
+- Foundation tier (BTC/ETH/SOL): Max 5% position, lower risk tolerance
+- Growth tier: Max 3% position, medium risk tolerance
+- Opportunity tier: Max 1% position, higher risk tolerance but strict safety checks
+
+Provide your analysis in the following JSON format:
+{
+    "action": "BUY|SELL|HOLD",
+    "confidence": 0.85,
+    "entry_price": 100.50,
+    "take_profit": 120.00,
+    "stop_loss": 95.00,
+    "reasoning": "Detailed analysis of why this trade makes sense...",
+    "risk_factors": ["Factor 1", "Factor 2"],
+    "opportunity_factors": ["Factor 1", "Factor 2"],
+    "time_horizon": "short|medium|long"
+}
+
+Consider:
+1. Technical indicators and chart patterns
+2. Market sentiment and social signals
+3. On-chain metrics (volume, liquidity, holder distribution)
+4. Risk/reward ratio
+5. Current market regime (bull/bear/sideways)
+6. Portfolio diversification needs
+
+Be conservative with confidence scores. Only recommend BUY with high confidence when:
+- Multiple indicators align
+- Risk/reward ratio > 2:1
+- Adequate liquidity and volume
+- No major red flags in on-chain data
+
+Return ONLY the JSON, no other text.
+""")
+
+
 class TradeAction(str, Enum):
     """Possible trade actions."""
     BUY = "BUY"
@@ -93,12 +181,18 @@ class TradingAgent:
         key = api_key or get_ai_api_key()
         genai.configure(api_key=key)
         
-        # Initialize models
-        self.flash_model = genai.GenerativeModel(self.config.flash_model)
-        self.pro_model = genai.GenerativeModel(self.config.pro_model)
-        
         logger.info(f"Trading agent initialized with models: {self.config.flash_model}, {self.config.pro_model}")
     
+    @cached_property
+    def flash_model(self):
+        """Fast analysis model, created on first use."""
+        return genai.GenerativeModel(self.config.flash_model)
+    
+    @cached_property
+    def pro_model(self):
+        """Deep analysis model, created on first use."""
+        return genai.GenerativeModel(self.config.pro_model)
+    
     def analyze_trade(
         self,
         request: AnalysisRequest,
@@ -153,62 +247,16 @@ class TradingAgent:
     
     def _build_analysis_prompt(self, request: AnalysisRequest) -> str:
         """Build the analysis prompt for Gemini."""
-        
-        prompt = f"""You are an expert crypto trading analyst. Analyze the following market data and provide a trading recommendation.
-
-**Asset:** {request.symbol} ({request.tier.value} tier)
-**Current Price:** ${request.current_price}
-
-**Market Data:**
-{json.dumps(request.market_data, indent=2)}
-
-**Technical Indicators:**
-{json.dumps(request.technical_indicators or {}, indent=2)}
-
-**Sentiment Data:**
-{json.dumps(request.sentiment_data or {}, indent=2)}
-
-**On-Chain Data:**
-{json.dumps(request.on_chain_data or {}, indent=2)}
-
-**Portfolio Context:**
-{json.dumps(request.portfolio_context or {}, indent=2)}
-
-**Risk Management Rules:**
-- Foundation tier (BTC/ETH/SOL): Max 5% position, lower risk tolerance
-- Growth tier: Max 3% position, medium risk tolerance
-- Opportunity tier: Max 1% position, higher risk tolerance but strict safety checks
-
-Provide your analysis in the following JSON format:
-{{
-    "action": "BUY|SELL|HOLD",
-    "confidence": 0.85,
-    "entry_price": 100.50,
-    "take_profit": 120.00,
-    "stop_loss": 95.00,
-    "reasoning": "Detailed analysis of why this trade makes sense...",
-    "risk_factors": ["Factor 1", "Factor 2"],
-    "opportunity_factors": ["Factor 1", "Factor 2"],
-    "time_horizon": "short|medium|long"
-}}
-
-Consider:
-1. Technical indicators and chart patterns
-2. Market sentiment and social signals
-3. On-chain metrics (volume, liquidity, holder distribution)
-4. Risk/reward ratio
-5. Current market regime (bull/bear/sideways)
-6. Portfolio diversification needs
-
-Be conservative with confidence scores. Only recommend BUY with high confidence when:
-- Multiple indicators align
-- Risk/reward ratio > 2:1
-- Adequate liquidity and volume
-- No major red flags in on-chain data
-
-Return ONLY the JSON, no other text.
-"""
-        return prompt
+        return _ANALYSIS_PROMPT.substitute(
+            symbol=request.symbol,
+            tier=request.tier.value,
+            current_price=request.current_price,
+            market_data=json.dumps(request.market_data, indent=2),
+            technical_indicators=json.dumps(request.technical_indicators or {}, indent=2),
+            sentiment_data=json.dumps(request.sentiment_data or {}, indent=2),
+            on_chain_data=json.dumps(request.on_chain_data or {}, indent=2),
+            portfolio_context=json.dumps(request.portfolio_context or {}, indent=2),
+        )
     
     def _parse_response(self, response_text: str) -> AnalysisResponse:
         """
@@ -222,17 +270,10 @@ Return ONLY the JSON, no other text.
         """
         try:
             # Extract JSON from response (handle markdown code blocks)
-            response_text = response_text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
+            response_text = _strip_code_fence(response_text)
             
             # Parse JSON
-            data = json.loads(response_text)
+            data = _loads(response_text)
             
             # Convert to AnalysisResponse
             return AnalysisResponse(
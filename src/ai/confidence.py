@@ -5,15 +5,27 @@ Calibrates and tracks the accuracy of AI confidence scores over time.
 """
 
 import logging
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+# Factor weights, in the column order expected by weighted_confidence_batch
+_FACTOR_WEIGHTS = {
+    "technical_score": Decimal("0.25"),
+    "sentiment_score": Decimal("0.15"),
+    "liquidity_score": Decimal("0.20"),
+    "risk_reward_score": Decimal("0.25"),
+    "historical_accuracy": Decimal("0.15"),
+}
+_FACTOR_WEIGHT_VECTOR = np.array([float(w) for w in _FACTOR_WEIGHTS.values()])
+
 
 class ConfidenceFactors(BaseModel):
     """Factors contributing to confidence score."""
@@ -27,23 +39,26 @@ class ConfidenceFactors(BaseModel):
     @property
     def weighted_confidence(self) -> Decimal:
         """Calculate weighted confidence from factors."""
-        weights = {
-            "technical": Decimal("0.25"),
-            "sentiment": Decimal("0.15"),
-            "liquidity": Decimal("0.20"),
-            "risk_reward": Decimal("0.25"),
-            "historical": Decimal("0.15"),
-        }
-        
-        confidence = (
-            self.technical_score * weights["technical"] +
-            self.sentiment_score * weights["sentiment"] +
-            self.liquidity_score * weights["liquidity"] +
-            self.risk_reward_score * weights["risk_reward"] +
-            self.historical_accuracy * weights["historical"]
+        confidence = sum(
+            getattr(self, name) * weight for name, weight in _FACTOR_WEIGHTS.items()
         )
         
         return min(confidence, Decimal("1.0"))
+    
+    @staticmethod
+    def weighted_confidence_batch(factors: np.ndarray) -> np.ndarray:
+        """
+        Calculate weighted confidence for many factor sets at once.
+        
+        Args:
+            factors: Array of shape (N, 5) with columns technical, sentiment,
+                     liquidity, risk_reward, historical
+        
+        Returns:
+            Array of N confidence scores (float64, capped at 1.0)
+        """
+        factors = np.asarray(factors, dtype=np.float64)
+        return np.minimum(factors @ _FACTOR_WEIGHT_VECTOR, 1.0)
 
 
 @dataclass
@@ -69,6 +84,14 @@ class ConfidenceScorer:
         self.calibration_bins = 10  # Divide confidence into 10 bins
         self.min_samples_for_calibration = 20
         
+        # Running aggregates over trade_history, so metrics never rescan it
+        self._bin_counts = [0] * self.calibration_bins
+        self._bin_wins = [0] * self.calibration_bins
+        self._bin_pnl = [Decimal("0")] * self.calibration_bins
+        self._total_wins = 0
+        self._confidence_sum = Decimal("0")
+        self._squared_error_sum = Decimal("0")
+    
     def calculate_confidence(
         self,
         factors: ConfidenceFactors,
@@ -122,21 +145,14 @@ class ConfidenceScorer:
         
         # Find which bin this confidence falls into
         bin_index = min(int(raw_confidence * self.calibration_bins), self.calibration_bins - 1)
-        bin_min = Decimal(bin_index) / self.calibration_bins
-        bin_max = Decimal(bin_index + 1) / self.calibration_bins
-        
-        # Get trades in this confidence bin
-        trades_in_bin = [
-            t for t in self.trade_history
-            if bin_min <= t.predicted_confidence < bin_max
-        ]
+        trades_in_bin = self._bin_counts[bin_index]
         
-        if len(trades_in_bin) < 5:
+        if trades_in_bin < 5:
             # Not enough data in this bin
             return raw_confidence
         
         # Calculate actual success rate in this bin
-        success_rate = sum(1 for t in trades_in_bin if t.actual_success) / len(trades_in_bin)
+        success_rate = self._bin_wins[bin_index] / trades_in_bin
         calibrated_confidence = Decimal(str(success_rate))
         
         # Blend with raw confidence (50/50) to avoid over-fitting
@@ -164,12 +180,64 @@ class ConfidenceScorer:
         )
         
         self.trade_history.append(outcome)
+        self._accumulate(outcome, 1)
+        self._trim_history()
+        
+        logger.info(f"Recorded outcome: confidence={predicted_confidence:.2%}, success={actual_success}, P/L={profit_loss_pct:.2%}")
+    
+    def record_outcomes_bulk(self, outcomes: List[TradeOutcome]):
+        """
+        Record many trade outcomes at once (e.g. a calibration backfill).
+        
+        Args:
+            outcomes: Outcomes to record, keeping their own timestamps
+        """
+        if not outcomes:
+            return
+        
+        out_of_order = (
+            self.trade_history
+            and outcomes[0].timestamp < self.trade_history[-1].timestamp
+        )
+        self.trade_history.extend(outcomes)
+        for outcome in outcomes:
+            self._accumulate(outcome, 1)
+        
+        # get_recent_accuracy relies on chronological order
+        if out_of_order or any(
+            a.timestamp > b.timestamp for a, b in zip(outcomes, outcomes[1:])
+        ):
+            self.trade_history.sort(key=lambda t: t.timestamp)
+        
+        self._trim_history()
         
-        # Keep only last 1000 trades for calibration
+        logger.info(f"Recorded {len(outcomes)} outcomes")
+    
+    def _trim_history(self) -> None:
+        """Keep only last 1000 trades for calibration."""
         if len(self.trade_history) > 1000:
+            for dropped in self.trade_history[:-1000]:
+                self._accumulate(dropped, -1)
             self.trade_history = self.trade_history[-1000:]
+    
+    def _bin_for(self, confidence: Decimal) -> Optional[int]:
+        """Calibration bin for a predicted confidence, or None if outside [0, 1)."""
+        if not 0 <= confidence < 1:
+            return None
+        return int(confidence * self.calibration_bins)
+    
+    def _accumulate(self, outcome: TradeOutcome, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) an outcome from the running aggregates."""
+        success = 1 if outcome.actual_success else 0
+        self._total_wins += sign * success
+        self._confidence_sum += sign * outcome.predicted_confidence
+        self._squared_error_sum += sign * (outcome.predicted_confidence - success) ** 2
         
-        logger.info(f"Recorded outcome: confidence={predicted_confidence:.2%}, success={actual_success}, P/L={profit_loss_pct:.2%}")
+        bin_index = self._bin_for(outcome.predicted_confidence)
+        if bin_index is not None:
+            self._bin_counts[bin_index] += sign
+            self._bin_wins[bin_index] += sign * success
+            self._bin_pnl[bin_index] += sign * outcome.profit_loss_pct
     
     def get_calibration_metrics(self) -> Dict:
         """
@@ -184,37 +252,30 @@ class ConfidenceScorer:
         # Calculate metrics by confidence bin
         bin_metrics = []
         for bin_idx in range(self.calibration_bins):
-            bin_min = Decimal(bin_idx) / self.calibration_bins
-            bin_max = Decimal(bin_idx + 1) / self.calibration_bins
-            
-            trades_in_bin = [
-                t for t in self.trade_history
-                if bin_min <= t.predicted_confidence < bin_max
-            ]
+            count = self._bin_counts[bin_idx]
             
-            if trades_in_bin:
-                success_rate = sum(1 for t in trades_in_bin if t.actual_success) / len(trades_in_bin)
-                avg_pnl = sum(t.profit_loss_pct for t in trades_in_bin) / len(trades_in_bin)
+            if count:
+                bin_min = Decimal(bin_idx) / self.calibration_bins
+                bin_max = Decimal(bin_idx + 1) / self.calibration_bins
+                success_rate = self._bin_wins[bin_idx] / count
+                avg_pnl = self._bin_pnl[bin_idx] / count
                 
                 bin_metrics.append({
                     "bin": f"{float(bin_min):.1f}-{float(bin_max):.1f}",
                     "predicted_confidence": float((bin_min + bin_max) / 2),
                     "actual_success_rate": float(success_rate),
                     "avg_pnl_pct": float(avg_pnl),
-                    "count": len(trades_in_bin)
+                    "count": count
                 })
         
         # Calculate overall metrics
-        total_success = sum(1 for t in self.trade_history if t.actual_success)
-        overall_success_rate = total_success / len(self.trade_history)
+        total_trades = len(self.trade_history)
+        overall_success_rate = self._total_wins / total_trades
         
-        avg_confidence = sum(t.predicted_confidence for t in self.trade_history) / len(self.trade_history)
+        avg_confidence = self._confidence_sum / total_trades
         
         # Calculate calibration error (Brier score)
-        brier_score = sum(
-            (t.predicted_confidence - (1 if t.actual_success else 0)) ** 2
-            for t in self.trade_history
-        ) / len(self.trade_history)
+        brier_score = self._squared_error_sum / total_trades
         
         return {
             "total_trades": len(self.trade_history),
@@ -236,7 +297,10 @@ class ConfidenceScorer:
             Success rate over the period, or None if insufficient data
         """
         cutoff = datetime.now() - timedelta(days=days)
-        recent_trades = [t for t in self.trade_history if t.timestamp > cutoff]
+        
+        # History is appended in time order, so binary-search the cutoff
+        start = bisect_right(self.trade_history, cutoff, key=lambda t: t.timestamp)
+        recent_trades = self.trade_history[start:]
         
         if len(recent_trades) < 5:
             return None
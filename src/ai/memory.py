@@ -8,17 +8,24 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, get_args
 
+import numpy as np
 import pinecone
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_DIM = 384  # Dimension for text embedding models
+MAX_CACHED_TRADES = 10_000  # Trades kept in the local similarity cache
+
 
 class TradePattern(BaseModel):
     """Pattern extracted from a historical trade."""
     
+    # Immutable (and hashable); unknown metadata keys from the index are dropped
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     trade_id: str = Field(description="Unique trade identifier")
     symbol: str = Field(description="Token symbol")
     entry_price: Decimal = Field(description="Entry price")
@@ -43,6 +50,47 @@ class TradePattern(BaseModel):
     holding_period_hours: Optional[int] = Field(default=None, description="How long held")
 
 
+def _fields_of_type(model: type[BaseModel], field_type: type) -> frozenset:
+    """Names of model fields annotated as ``field_type`` or ``Optional[field_type]``."""
+    return frozenset(
+        name for name, info in model.model_fields.items()
+        if info.annotation is field_type or field_type in get_args(info.annotation)
+    )
+
+
+# Resolved once at import so metadata conversion touches only the fields that need it
+_DECIMAL_FIELDS = _fields_of_type(TradePattern, Decimal)
+_DATETIME_FIELDS = _fields_of_type(TradePattern, datetime)
+
+
+def _to_metadata(pattern: TradePattern) -> Dict:
+    """Convert a trade pattern to Pinecone-compatible metadata."""
+    metadata = pattern.model_dump()
+    
+    # Convert Decimal to float for Pinecone
+    for key in _DECIMAL_FIELDS:
+        if metadata[key] is not None:
+            metadata[key] = float(metadata[key])
+    # Store datetimes as epoch seconds (cheap to decode, range-filterable)
+    for key in _DATETIME_FIELDS:
+        metadata[key] = metadata[key].timestamp()
+    
+    return metadata
+
+
+def _unit_vector(embedding: List[float]) -> np.ndarray:
+    """Check an embedding's dimension and return it unit-normalised as float32."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    if vector.shape != (EMBEDDING_DIM,):
+        raise ValueError(
+            f"Embedding must have shape ({EMBEDDING_DIM},), got {vector.shape}"
+        )
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector = vector / norm
+    return vector
+
+
 class TradeMemory:
     """
     Vector database for trade pattern storage and retrieval.
@@ -54,7 +102,8 @@ class TradeMemory:
         self,
         api_key: str,
         environment: str = "us-west-2-aws",
-        index_name: str = "arbitra-trades"
+        index_name: str = "arbitra-trades",
+        max_cached_trades: int = MAX_CACHED_TRADES
     ):
         """
         Initialize trade memory system.
@@ -63,8 +112,14 @@ class TradeMemory:
             api_key: Pinecone API key
             environment: Pinecone environment
             index_name: Name of the Pinecone index
+            max_cached_trades: Trades kept for local similarity probes; the
+                oldest are evicted first once the cache is full
         """
+        if max_cached_trades <= 0:
+            raise ValueError("max_cached_trades must be positive")
+        
         self.index_name = index_name
+        self.max_cached_trades = max_cached_trades
         
         # Initialize Pinecone
         pinecone.init(api_key=api_key, environment=environment)
@@ -74,12 +129,71 @@ class TradeMemory:
             logger.info(f"Creating Pinecone index: {index_name}")
             pinecone.create_index(
                 name=index_name,
-                dimension=384,  # Dimension for text embedding models
+                dimension=EMBEDDING_DIM,
                 metric="cosine"
             )
         
         self.index = pinecone.Index(index_name)
         logger.info(f"Connected to Pinecone index: {index_name}")
+        
+        self._reset_cache()
+    
+    def _reset_cache(self) -> None:
+        """Empty the in-process cache of stored trades used for warm similarity probes."""
+        # Rows [0, len(_trade_ids)) of _emb_matrix hold unit-normalised
+        # embeddings, with each trade's symbol and confidence alongside for
+        # filtering. Capacity doubles as trades are added, up to
+        # max_cached_trades; after that new trades overwrite the oldest row.
+        self._emb_matrix = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self._cache_symbols = np.empty(0, dtype=object)
+        self._cache_confidences = np.empty(0)
+        self._trade_ids: List[str] = []
+        self._cached_patterns: List[TradePattern] = []
+        self._cache_rows: Dict[str, int] = {}
+        self._next_eviction = 0
+    
+    def _grow_cache(self) -> None:
+        """Double the cache capacity (at least 64 rows, at most max_cached_trades)."""
+        count = len(self._trade_ids)
+        capacity = min(max(2 * count, 64), self.max_cached_trades)
+        
+        emb_matrix = np.empty((capacity, EMBEDDING_DIM), dtype=np.float32)
+        emb_matrix[:count] = self._emb_matrix[:count]
+        symbols = np.empty(capacity, dtype=object)
+        symbols[:count] = self._cache_symbols[:count]
+        confidences = np.empty(capacity)
+        confidences[:count] = self._cache_confidences[:count]
+        
+        self._emb_matrix = emb_matrix
+        self._cache_symbols = symbols
+        self._cache_confidences = confidences
+    
+    def _cache_trade(self, pattern: TradePattern, vector: np.ndarray) -> None:
+        """Add (or replace) a trade in the local cache, evicting the oldest when full."""
+        row = self._cache_rows.get(pattern.trade_id)
+        if row is None:
+            count = len(self._trade_ids)
+            if count < self.max_cached_trades:
+                if count == len(self._emb_matrix):
+                    self._grow_cache()
+                row = count
+                self._trade_ids.append(pattern.trade_id)
+                self._cached_patterns.append(pattern)
+            else:
+                # Rows were filled in insertion order, so a rotating pointer
+                # always lands on the oldest trade
+                row = self._next_eviction
+                self._next_eviction = (row + 1) % self.max_cached_trades
+                del self._cache_rows[self._trade_ids[row]]
+                self._trade_ids[row] = pattern.trade_id
+                self._cached_patterns[row] = pattern
+            self._cache_rows[pattern.trade_id] = row
+        else:
+            self._cached_patterns[row] = pattern
+        
+        self._emb_matrix[row] = vector
+        self._cache_symbols[row] = pattern.symbol
+        self._cache_confidences[row] = float(pattern.confidence)
     
     def store_trade(
         self,
@@ -92,28 +206,62 @@ class TradeMemory:
         Args:
             pattern: Trade pattern to store
             embedding: Vector embedding of the trade (384-dim)
+        
+        Raises:
+            ValueError: If the embedding is not EMBEDDING_DIM long
         """
+        vector = _unit_vector(embedding)
+        
         try:
-            # Convert pattern to metadata
-            metadata = pattern.model_dump()
-            
-            # Convert Decimal to float for Pinecone
-            for key, value in metadata.items():
-                if isinstance(value, Decimal):
-                    metadata[key] = float(value)
-                elif isinstance(value, datetime):
-                    metadata[key] = value.isoformat()
-            
             # Upsert to Pinecone
             self.index.upsert(
-                vectors=[(pattern.trade_id, embedding, metadata)]
+                vectors=[(pattern.trade_id, embedding, _to_metadata(pattern))]
             )
+            self._cache_trade(pattern, vector)
             
             logger.info(f"Stored trade {pattern.trade_id} ({pattern.symbol})")
             
         except Exception as e:
             logger.error(f"Error storing trade: {e}", exc_info=True)
     
+    def store_trades_bulk(
+        self,
+        patterns: List[TradePattern],
+        embeddings: List[List[float]],
+        batch_size: int = 100
+    ):
+        """
+        Store many trade patterns, one upsert per batch.
+        
+        Args:
+            patterns: Trade patterns to store
+            embeddings: Vector embeddings, one per pattern
+            batch_size: Vectors per upsert (Pinecone accepts up to 100)
+        
+        Raises:
+            ValueError: If the lengths differ or an embedding is not
+                EMBEDDING_DIM long (nothing is stored in either case)
+        """
+        if len(patterns) != len(embeddings):
+            raise ValueError("patterns and embeddings must have the same length")
+        
+        unit_vectors = [_unit_vector(embedding) for embedding in embeddings]
+        
+        vectors = [
+            (pattern.trade_id, embedding, _to_metadata(pattern))
+            for pattern, embedding in zip(patterns, embeddings)
+        ]
+        
+        for start in range(0, len(vectors), batch_size):
+            try:
+                self.index.upsert(vectors=vectors[start:start + batch_size])
+                for i in range(start, min(start + batch_size, len(vectors))):
+                    self._cache_trade(patterns[i], unit_vectors[i])
+            except Exception as e:
+                logger.error(f"Error storing trade batch at offset {start}: {e}", exc_info=True)
+        
+        logger.info(f"Stored {len(vectors)} trades")
+    
     def find_similar_trades(
         self,
         query_embedding: List[float],
@@ -155,15 +303,15 @@ class TradeMemory:
                 try:
                     metadata = match.metadata
                     
-                    # Convert timestamp back to datetime
-                    if "timestamp" in metadata:
-                        metadata["timestamp"] = datetime.fromisoformat(metadata["timestamp"])
+                    # Convert timestamp back to datetime (older records use ISO strings)
+                    timestamp = metadata.get("timestamp")
+                    if isinstance(timestamp, str):
+                        metadata["timestamp"] = datetime.fromisoformat(timestamp)
+                    elif timestamp is not None:
+                        metadata["timestamp"] = datetime.fromtimestamp(timestamp)
                     
                     # Convert numeric fields back to Decimal
-                    decimal_fields = ["entry_price", "exit_price", "profit_loss_pct", 
-                                     "rsi", "volume_24h", "market_cap", "sentiment_score", 
-                                     "confidence", "max_drawdown"]
-                    for field in decimal_fields:
+                    for field in _DECIMAL_FIELDS:
                         if field in metadata and metadata[field] is not None:
                             metadata[field] = Decimal(str(metadata[field]))
                     
@@ -181,11 +329,67 @@ class TradeMemory:
             logger.error(f"Error finding similar trades: {e}", exc_info=True)
             return []
     
+    def find_similar_trades_local(
+        self,
+        query_embedding: List[float],
+        k: int = 10,
+        symbol: Optional[str] = None,
+        min_confidence: Optional[Decimal] = None
+    ) -> List[TradePattern]:
+        """
+        Find similar trades among those stored by this process.
+        
+        Ranks cached trades by cosine similarity without a Pinecone round
+        trip, applying the same filters as find_similar_trades. Falls back to
+        find_similar_trades when the cache is empty. Only the most recent
+        max_cached_trades trades are searched.
+        
+        Args:
+            query_embedding: Embedding of current market conditions
+            k: Maximum number of results
+            symbol: Filter by symbol (optional)
+            min_confidence: Minimum confidence threshold (optional)
+        
+        Returns:
+            Up to k trade patterns, most similar first
+        
+        Raises:
+            ValueError: If the query embedding is not EMBEDDING_DIM long
+        """
+        count = len(self._trade_ids)
+        if count == 0:
+            return self.find_similar_trades(
+                query_embedding, symbol=symbol, min_confidence=min_confidence, limit=k
+            )
+        
+        query = _unit_vector(query_embedding)
+        sims = self._emb_matrix[:count] @ query
+        
+        if symbol or min_confidence:
+            keep = np.ones(count, dtype=bool)
+            if symbol:
+                keep &= self._cache_symbols[:count] == symbol
+            if min_confidence:
+                keep &= self._cache_confidences[:count] >= float(min_confidence)
+            candidates = np.flatnonzero(keep)
+            sims = sims[candidates]
+        else:
+            candidates = np.arange(count)
+        
+        k = min(k, len(candidates))
+        if k == 0:
+            return []
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        
+        return [self._cached_patterns[i] for i in candidates[top]]
+    
     def get_success_rate_for_pattern(
         self,
         query_embedding: List[float],
         symbol: Optional[str] = None,
-        limit: int = 20
+        limit: int = 20,
+        patterns: Optional[List[TradePattern]] = None
     ) -> Optional[Decimal]:
         """
         Get historical success rate for similar patterns.
@@ -194,15 +398,20 @@ class TradeMemory:
             query_embedding: Embedding of current pattern
             symbol: Filter by symbol (optional)
             limit: Number of similar trades to analyze
+            patterns: Trades already returned by find_similar_trades (optional).
+                      When given, the index is not queried again.
             
         Returns:
             Success rate (0-1) or None if insufficient data
         """
-        similar_trades = self.find_similar_trades(
-            query_embedding=query_embedding,
-            symbol=symbol,
-            limit=limit
-        )
+        if patterns is not None:
+            similar_trades = patterns
+        else:
+            similar_trades = self.find_similar_trades(
+                query_embedding=query_embedding,
+                symbol=symbol,
+                limit=limit
+            )
         
         # Filter only closed trades with outcomes
         closed_trades = [t for t in similar_trades if t.success is not None]
@@ -238,32 +447,30 @@ class TradeMemory:
             holding_period_hours: How long the trade was held
         """
         try:
-            # Fetch the trade
-            fetch_response = self.index.fetch(ids=[trade_id])
-            
-            if trade_id not in fetch_response.vectors:
-                logger.error(f"Trade {trade_id} not found in memory")
-                return
-            
-            # Get existing vector and metadata
-            vector_data = fetch_response.vectors[trade_id]
-            metadata = vector_data.metadata.copy()
-            embedding = vector_data.values
-            
-            # Update with outcome
-            metadata.update({
-                "exit_price": float(exit_price),
-                "profit_loss_pct": float(profit_loss_pct),
-                "success": success,
-                "max_drawdown": float(max_drawdown),
-                "holding_period_hours": holding_period_hours
-            })
-            
-            # Upsert with updated metadata
-            self.index.upsert(
-                vectors=[(trade_id, embedding, metadata)]
+            # Metadata-only update: the stored embedding is kept server-side,
+            # so no fetch/re-upsert round trip is needed. Unknown ids raise
+            # and are logged below.
+            self.index.update(
+                id=trade_id,
+                set_metadata={
+                    "exit_price": float(exit_price),
+                    "profit_loss_pct": float(profit_loss_pct),
+                    "success": success,
+                    "max_drawdown": float(max_drawdown),
+                    "holding_period_hours": holding_period_hours
+                }
             )
             
+            row = self._cache_rows.get(trade_id)
+            if row is not None:
+                self._cached_patterns[row] = self._cached_patterns[row].model_copy(update={
+                    "exit_price": exit_price,
+                    "profit_loss_pct": profit_loss_pct,
+                    "success": success,
+                    "max_drawdown": max_drawdown,
+                    "holding_period_hours": holding_period_hours
+                })
+            
             logger.info(f"Updated trade {trade_id} with outcome: {'SUCCESS' if success else 'FAIL'} ({profit_loss_pct:.2%})")
             
         except Exception as e:
@@ -291,6 +498,7 @@ class TradeMemory:
         """Clear all trades from memory (use with caution!)."""
         try:
             self.index.delete(delete_all=True)
+            self._reset_cache()
             logger.warning("Cleared all trades from memory")
         except Exception as e:
             logger.error(f"Error clearing memory: {e}")
@@ -8,13 +8,61 @@ real trading with realistic slippage, fees, and execution.
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
+# Shared Decimal constants so hot paths don't re-parse literals on every call
+_ZERO = Decimal("0")
+_ONE = Decimal("1")
+_HUNDRED = Decimal("100")
 
-@dataclass
+# Filled from get_performance_metrics() (plus win_rate_pct) by generate_report
+_REPORT_TEMPLATE = """
+╔══════════════════════════════════════════════════════════════╗
+║           PAPER TRADING PERFORMANCE REPORT                   ║
+╚══════════════════════════════════════════════════════════════╝
+
+📊 CAPITAL
+  Initial:           ${initial_capital:>12,.2f}
+  Current Cash:      ${cash:>12,.2f}
+  
+💰 PROFIT & LOSS
+  Total P/L:         ${total_pnl:>12,.2f}
+  Total Return:       {total_pnl_pct:>12,.2f}%
+  Max Drawdown:       {max_drawdown_pct:>12,.2f}%
+  
+📈 TRADING STATISTICS
+  Total Trades:       {total_trades:>12}
+  Winners:            {winning_trades:>12}
+  Losers:             {losing_trades:>12}
+  Win Rate:           {win_rate_pct:>12,.1f}%
+  
+  Average Win:       ${avg_win:>12,.2f}
+  Average Loss:      ${avg_loss:>12,.2f}
+  Profit Factor:      {profit_factor:>12,.2f}
+  
+📊 RISK METRICS
+  Sharpe Ratio:       {sharpe_ratio:>12,.2f}
+  
+⏱️  TIME METRICS
+  Runtime:            {runtime_days:>12,.1f} days
+  Trades/Day:         {trades_per_day:>12,.1f}
+  Avg Hold Time:      {avg_holding_hours:>12,.1f} hours
+  
+💸 COSTS
+  Total Fees:        ${total_fees_paid:>12,.2f}
+  
+📍 CURRENT STATUS
+  Open Positions:     {open_positions:>12}
+
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+
+@dataclass(slots=True)
 class PaperPosition:
     """Simulated position."""
     symbol: str
@@ -43,11 +91,11 @@ class PaperPosition:
     def unrealized_pnl_pct(self, current_price: Decimal) -> Decimal:
         """Unrealized P/L percentage."""
         if self.cost_basis == 0:
-            return Decimal("0")
-        return (self.unrealized_pnl(current_price) / self.cost_basis) * Decimal("100")
+            return _ZERO
+        return (self.unrealized_pnl(current_price) / self.cost_basis) * _HUNDRED
 
 
-@dataclass
+@dataclass(slots=True)
 class PaperTrade:
     """Completed simulated trade."""
     symbol: str
@@ -93,6 +141,9 @@ class PaperTradingEngine:
         self.cash = initial_capital
         self.fee_rate = fee_rate
         self.slippage_rate = slippage_rate
+        # Fill-price multipliers, computed once (buys fill above, sells below)
+        self._buy_slippage_mul = _ONE + slippage_rate
+        self._sell_slippage_mul = _ONE - slippage_rate
         
         self.positions: Dict[str, PaperPosition] = {}
         self.closed_trades: List[PaperTrade] = []
@@ -101,9 +152,63 @@ class PaperTradingEngine:
         # Performance tracking
         self.peak_value = initial_capital
         self.daily_pnl: Dict[str, Decimal] = {}  # date -> pnl
+        self._today_ordinal = 0
+        self._today_iso = ""
+        self._reset_trade_stats()
         
         logger.info(f"Paper trading initialized with ${initial_capital:,.2f}")
     
+    def _reset_trade_stats(self) -> None:
+        """Zero the running closed-trade statistics behind get_performance_metrics."""
+        self._total_pnl = _ZERO
+        self._num_trades = 0
+        self._num_wins = 0
+        self._gross_profit = _ZERO
+        self._gross_loss = _ZERO  # Sum of |pnl| over losing trades
+        self._total_fees = _ZERO
+        self._total_holding_hours = 0.0
+        # Realized equity curve, for max drawdown
+        self._equity = self.initial_capital
+        self._equity_peak = self.initial_capital
+        self._max_drawdown = _ZERO
+        # Welford running mean/variance of pnl_pct, for the Sharpe ratio
+        self._return_mean = 0.0
+        self._return_m2 = 0.0
+    
+    def _record_trade_stats(self, trade: PaperTrade) -> None:
+        """Fold a closed trade into the running statistics."""
+        pnl = trade.pnl
+        self._num_trades += 1
+        self._total_pnl += pnl
+        if pnl > 0:
+            self._num_wins += 1
+            self._gross_profit += pnl
+        else:
+            self._gross_loss += abs(pnl)
+        self._total_fees += trade.fees_paid
+        self._total_holding_hours += trade.holding_period_hours
+        
+        self._equity += pnl
+        self._equity_peak = max(self._equity_peak, self._equity)
+        if self._equity_peak > 0:
+            drawdown = ((self._equity_peak - self._equity) / self._equity_peak) * _HUNDRED
+            self._max_drawdown = max(self._max_drawdown, drawdown)
+        
+        ret = float(trade.pnl_pct)
+        delta = ret - self._return_mean
+        self._return_mean += delta / self._num_trades
+        self._return_m2 += delta * (ret - self._return_mean)
+    
+    def reset(self) -> None:
+        """Return to the freshly initialized state, keeping capital and rate settings."""
+        self.cash = self.initial_capital
+        self.positions.clear()
+        self.closed_trades.clear()
+        self.start_time = datetime.now()
+        self.peak_value = self.initial_capital
+        self.daily_pnl.clear()
+        self._reset_trade_stats()
+    
     def execute_buy(
         self,
         symbol: str,
@@ -112,7 +217,8 @@ class PaperTradingEngine:
         stop_loss: Optional[Decimal] = None,
         take_profit: Optional[Decimal] = None,
         strategy: str = "unknown",
-        confidence: Decimal = Decimal("0.5")
+        confidence: Decimal = Decimal("0.5"),
+        entry_time: Optional[datetime] = None
     ) -> bool:
         """
         Execute simulated buy order.
@@ -125,6 +231,7 @@ class PaperTradingEngine:
             take_profit: Take profit price
             strategy: Strategy name
             confidence: AI confidence score
+            entry_time: Fill timestamp (defaults to now)
             
         Returns:
             True if order executed successfully
@@ -139,7 +246,7 @@ class PaperTradingEngine:
             return False
         
         # Simulate slippage (buy at slightly higher price)
-        execution_price = price * (Decimal("1") + self.slippage_rate)
+        execution_price = price * self._buy_slippage_mul
         
         # Calculate costs
         cost = execution_price * quantity
@@ -170,11 +277,12 @@ class PaperTradingEngine:
         
         # Execute order
         self.cash -= total_cost
+        symbol = sys.intern(symbol)
         self.positions[symbol] = PaperPosition(
             symbol=symbol,
             entry_price=execution_price,
             quantity=quantity,
-            entry_time=datetime.now(),
+            entry_time=entry_time or datetime.now(),
             stop_loss=stop_loss,
             take_profit=take_profit,
             fees_paid=fees,
@@ -188,11 +296,41 @@ class PaperTradingEngine:
         )
         return True
     
+    def execute_buys(
+        self,
+        orders: Sequence[Tuple[str, Decimal, Decimal]],
+        strategy: str = "unknown",
+        confidence: Decimal = Decimal("0.5")
+    ) -> List[bool]:
+        """
+        Execute several simulated buy orders filled at the same moment.
+        
+        Orders are applied in sequence with the same validation as
+        execute_buy, so an order can fail on cash spent by earlier ones.
+        
+        Args:
+            orders: (symbol, quantity, price) for each order
+            strategy: Strategy name
+            confidence: AI confidence score
+        
+        Returns:
+            Per-order success flags
+        """
+        now = datetime.now()
+        return [
+            self.execute_buy(
+                symbol, quantity, price,
+                strategy=strategy, confidence=confidence, entry_time=now
+            )
+            for symbol, quantity, price in orders
+        ]
+    
     def execute_sell(
         self,
         symbol: str,
         current_price: Decimal,
-        exit_reason: str = "manual"
+        exit_reason: str = "manual",
+        exit_time: Optional[datetime] = None
     ) -> Optional[PaperTrade]:
         """
         Execute simulated sell order.
@@ -201,18 +339,18 @@ class PaperTradingEngine:
             symbol: Token symbol
             current_price: Current market price
             exit_reason: Reason for exit
+            exit_time: Fill time (defaults to now)
             
         Returns:
             Completed trade record
         """
-        if symbol not in self.positions:
+        position = self.positions.get(symbol)
+        if position is None:
             logger.warning(f"No position in {symbol} to sell")
             return None
         
-        position = self.positions[symbol]
-        
         # Simulate slippage (sell at slightly lower price)
-        execution_price = current_price * (Decimal("1") - self.slippage_rate)
+        execution_price = current_price * self._sell_slippage_mul
         
         # Calculate proceeds
         proceeds = execution_price * position.quantity
@@ -221,11 +359,15 @@ class PaperTradingEngine:
         
         # Calculate P/L
         pnl = net_proceeds - position.cost_basis
-        pnl_pct = (pnl / position.cost_basis) * Decimal("100") if position.cost_basis > 0 else Decimal("0")
+        pnl_pct = (pnl / position.cost_basis) * _HUNDRED if position.cost_basis > 0 else _ZERO
         
         # Update cash
         self.cash += net_proceeds
         
+        # One clock read per fill; the daily P/L bucket is derived from it
+        if exit_time is None:
+            exit_time = datetime.now()
+        
         # Record trade
         trade = PaperTrade(
             symbol=symbol,
@@ -233,7 +375,7 @@ class PaperTradingEngine:
             exit_price=execution_price,
             quantity=position.quantity,
             entry_time=position.entry_time,
-            exit_time=datetime.now(),
+            exit_time=exit_time,
             pnl=pnl,
             pnl_pct=pnl_pct,
             fees_paid=position.fees_paid + fees,
@@ -243,12 +385,11 @@ class PaperTradingEngine:
         )
         
         self.closed_trades.append(trade)
+        self._record_trade_stats(trade)
         
         # Update daily P/L
-        today = datetime.now().date().isoformat()
-        if today not in self.daily_pnl:
-            self.daily_pnl[today] = Decimal("0")
-        self.daily_pnl[today] += pnl
+        today = self._date_key(exit_time)
+        self.daily_pnl[today] = self.daily_pnl.get(today, _ZERO) + pnl
         
         # Remove position
         del self.positions[symbol]
@@ -260,6 +401,35 @@ class PaperTradingEngine:
         
         return trade
     
+    def execute_sells(
+        self,
+        orders: Sequence[Tuple[str, Decimal]],
+        exit_reason: str = "manual"
+    ) -> List[Optional[PaperTrade]]:
+        """
+        Execute several simulated sell orders filled at the same moment.
+        
+        Args:
+            orders: (symbol, current_price) for each order
+            exit_reason: Reason for exit
+        
+        Returns:
+            Completed trade records (None where there was no position)
+        """
+        now = datetime.now()
+        return [
+            self.execute_sell(symbol, price, exit_reason=exit_reason, exit_time=now)
+            for symbol, price in orders
+        ]
+    
+    def _date_key(self, timestamp: datetime) -> str:
+        """ISO date key for daily_pnl, re-formatted only when the day changes."""
+        ordinal = timestamp.toordinal()
+        if ordinal != self._today_ordinal:
+            self._today_ordinal = ordinal
+            self._today_iso = timestamp.date().isoformat()
+        return self._today_iso
+    
     def check_stop_loss_take_profit(
         self,
         symbol: str,
@@ -271,11 +441,10 @@ class PaperTradingEngine:
         Returns:
             Exit reason if triggered, None otherwise
         """
-        if symbol not in self.positions:
+        position = self.positions.get(symbol)
+        if position is None:
             return None
         
-        position = self.positions[symbol]
-        
         # Check stop loss
         if position.stop_loss and current_price <= position.stop_loss:
             return "stop_loss"
@@ -323,7 +492,7 @@ class PaperTradingEngine:
     def portfolio_value(self, market_prices: Dict[str, Decimal]) -> Decimal:
         """Calculate total portfolio value (cash + positions)."""
         position_value = sum(
-            pos.current_value(market_prices.get(symbol, Decimal("0")))
+            pos.current_value(market_prices.get(symbol, _ZERO))
             for symbol, pos in self.positions.items()
         )
         return self.cash + position_value
@@ -331,14 +500,14 @@ class PaperTradingEngine:
     @property
     def total_pnl(self) -> Decimal:
         """Calculate total realized P/L."""
-        return sum(trade.pnl for trade in self.closed_trades)
+        return self._total_pnl
     
     @property
     def total_pnl_pct(self) -> Decimal:
         """Calculate total P/L percentage."""
         if self.initial_capital == 0:
-            return Decimal("0")
-        return (self.total_pnl / self.initial_capital) * Decimal("100")
+            return _ZERO
+        return (self.total_pnl / self.initial_capital) * _HUNDRED
     
     def get_performance_metrics(self) -> Dict:
         """
@@ -347,31 +516,25 @@ class PaperTradingEngine:
         Returns:
             Dictionary with performance statistics
         """
-        if not self.closed_trades:
+        if not self._num_trades:
             return {
                 "error": "No completed trades",
                 "cash": float(self.cash),
                 "open_positions": len(self.positions)
             }
         
-        # Basic metrics
-        total_trades = len(self.closed_trades)
-        winning_trades = [t for t in self.closed_trades if t.pnl > 0]
-        losing_trades = [t for t in self.closed_trades if t.pnl <= 0]
+        # Basic metrics (from running totals kept by execute_sell)
+        total_trades = self._num_trades
+        winning_trades = self._num_wins
+        losing_trades = total_trades - winning_trades
         
-        win_rate = len(winning_trades) / total_trades if total_trades > 0 else 0
+        win_rate = winning_trades / total_trades if total_trades > 0 else 0
         
-        avg_win = (
-            sum(t.pnl for t in winning_trades) / len(winning_trades)
-            if winning_trades else Decimal("0")
-        )
-        avg_loss = (
-            sum(abs(t.pnl) for t in losing_trades) / len(losing_trades)
-            if losing_trades else Decimal("0")
-        )
+        avg_win = self._gross_profit / winning_trades if winning_trades else _ZERO
+        avg_loss = self._gross_loss / losing_trades if losing_trades else _ZERO
         
-        gross_profit = sum(t.pnl for t in winning_trades)
-        gross_loss = sum(abs(t.pnl) for t in losing_trades)
+        gross_profit = self._gross_profit
+        gross_loss = self._gross_loss
         profit_factor = (
             gross_profit / gross_loss
             if gross_loss > 0 else Decimal("999")
@@ -387,9 +550,7 @@ class PaperTradingEngine:
         sharpe = self._calculate_sharpe_ratio()
         
         # Average holding period
-        avg_holding_hours = (
-            sum(t.holding_period_hours for t in self.closed_trades) / total_trades
-        )
+        avg_holding_hours = self._total_holding_hours / total_trades
         
         return {
             "initial_capital": float(self.initial_capital),
@@ -397,8 +558,8 @@ class PaperTradingEngine:
             "total_pnl": float(self.total_pnl),
             "total_pnl_pct": float(self.total_pnl_pct),
             "total_trades": total_trades,
-            "winning_trades": len(winning_trades),
-            "losing_trades": len(losing_trades),
+            "winning_trades": winning_trades,
+            "losing_trades": losing_trades,
             "win_rate": win_rate,
             "avg_win": float(avg_win),
             "avg_loss": float(avg_loss),
@@ -409,34 +570,20 @@ class PaperTradingEngine:
             "trades_per_day": total_trades / runtime_days if runtime_days > 0 else 0,
             "avg_holding_hours": avg_holding_hours,
             "open_positions": len(self.positions),
-            "total_fees_paid": float(sum(t.fees_paid for t in self.closed_trades))
+            "total_fees_paid": float(self._total_fees)
         }
     
     def _calculate_max_drawdown(self) -> Decimal:
-        """Calculate maximum drawdown from peak."""
-        peak = self.initial_capital
-        max_dd = Decimal("0")
-        
-        running_value = self.initial_capital
-        for trade in self.closed_trades:
-            running_value += trade.pnl
-            peak = max(peak, running_value)
-            
-            if peak > 0:
-                drawdown = ((peak - running_value) / peak) * Decimal("100")
-                max_dd = max(max_dd, drawdown)
-        
-        return max_dd
+        """Maximum drawdown from peak of the realized equity curve."""
+        return self._max_drawdown
     
     def _calculate_sharpe_ratio(self) -> float:
         """Calculate Sharpe ratio from trade returns."""
-        if len(self.closed_trades) < 2:
+        if self._num_trades < 2:
             return 0.0
         
-        returns = [float(t.pnl_pct) for t in self.closed_trades]
-        avg_return = sum(returns) / len(returns)
-        
-        variance = sum((r - avg_return) ** 2 for r in returns) / len(returns)
+        avg_return = self._return_mean
+        variance = self._return_m2 / self._num_trades
         std_return = variance ** 0.5
         
         sharpe = avg_return / std_return if std_return > 0 else 0.0
@@ -449,47 +596,7 @@ class PaperTradingEngine:
         if "error" in metrics:
             return f"No trades to report. Cash: ${metrics['cash']:,.2f}"
         
-        report = f"""
-╔══════════════════════════════════════════════════════════════╗
-║           PAPER TRADING PERFORMANCE REPORT                   ║
-╚══════════════════════════════════════════════════════════════╝
-
-📊 CAPITAL
-  Initial:           ${metrics['initial_capital']:>12,.2f}
-  Current Cash:      ${metrics['cash']:>12,.2f}
-  
-💰 PROFIT & LOSS
-  Total P/L:         ${metrics['total_pnl']:>12,.2f}
-  Total Return:       {metrics['total_pnl_pct']:>12,.2f}%
-  Max Drawdown:       {metrics['max_drawdown_pct']:>12,.2f}%
-  
-📈 TRADING STATISTICS
-  Total Trades:       {metrics['total_trades']:>12}
-  Winners:            {metrics['winning_trades']:>12}
-  Losers:             {metrics['losing_trades']:>12}
-  Win Rate:           {metrics['win_rate']*100:>12,.1f}%
-  
-  Average Win:       ${metrics['avg_win']:>12,.2f}
-  Average Loss:      ${metrics['avg_loss']:>12,.2f}
-  Profit Factor:      {metrics['profit_factor']:>12,.2f}
-  
-📊 RISK METRICS
-  Sharpe Ratio:       {metrics['sharpe_ratio']:>12,.2f}
-  
-⏱️  TIME METRICS
-  Runtime:            {metrics['runtime_days']:>12,.1f} days
-  Trades/Day:         {metrics['trades_per_day']:>12,.1f}
-  Avg Hold Time:      {metrics['avg_holding_hours']:>12,.1f} hours
-  
-💸 COSTS
-  Total Fees:        ${metrics['total_fees_paid']:>12,.2f}
-  
-📍 CURRENT STATUS
-  Open Positions:     {metrics['open_positions']:>12}
-
-╚══════════════════════════════════════════════════════════════╝
-"""
-        return report
+        return _REPORT_TEMPLATE.format_map({**metrics, "win_rate_pct": metrics["win_rate"] * 100})
     
     def get_trade_history(self, limit: int = 10) -> List[Dict]:
         """Get recent trade history."""
@@ -1,10 +1,16 @@
 """Circuit breakers to halt trading during adverse conditions."""
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
-from typing import Dict, List, Optional
+from itertools import takewhile
+from typing import Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+_HUNDRED = Decimal("100")  # Percent scale, parsed once
 
 
 class BreakerType(Enum):
@@ -18,6 +24,10 @@ class BreakerType(Enum):
     CONSECUTIVE_LOSSES = "consecutive_losses"
 
 
+# One bit per breaker type for the tripped-breaker mask
+_BREAKER_BITS = {bt: 1 << i for i, bt in enumerate(BreakerType)}
+
+
 class BreakerState(Enum):
     """Circuit breaker states."""
     CLOSED = "closed"  # Normal operation
@@ -52,6 +62,8 @@ class CircuitBreaker:
     immediately until conditions improve or manual override occurs.
     """
     
+    MAX_EVENTS = 4096  # Oldest events are dropped beyond this
+    
     # Default configurations
     DEFAULT_CONFIGS = {
         BreakerType.DAILY_LOSS: BreakerConfig(
@@ -105,7 +117,9 @@ class CircuitBreaker:
         self.trip_times: Dict[BreakerType, Optional[datetime]] = {
             bt: None for bt in BreakerType
         }
-        self.events: List[BreakerEvent] = []
+        self.events: Deque[BreakerEvent] = deque(maxlen=self.MAX_EVENTS)
+        # Bit set for every breaker currently OPEN (mirrors self.states)
+        self._tripped_mask = 0
         
         # Tracking for various breaker types
         self.consecutive_losses = 0
@@ -125,13 +139,14 @@ class CircuitBreaker:
         Returns:
             True if breaker should trip
         """
-        if not self.configs[BreakerType.DAILY_LOSS].enabled:
+        # Degenerate baseline: nothing to measure a loss against
+        if start_of_day_value <= 0:
             return False
         
-        if start_of_day_value <= 0:
+        if not self.configs[BreakerType.DAILY_LOSS].enabled:
             return False
         
-        loss_pct = ((start_of_day_value - current_value) / start_of_day_value) * Decimal("100")
+        loss_pct = ((start_of_day_value - current_value) / start_of_day_value) * _HUNDRED
         threshold = self.configs[BreakerType.DAILY_LOSS].threshold
         
         if loss_pct > threshold:
@@ -147,13 +162,13 @@ class CircuitBreaker:
     
     def check_weekly_loss(self, current_value: Decimal, start_of_week_value: Decimal) -> bool:
         """Check if weekly loss threshold exceeded."""
-        if not self.configs[BreakerType.WEEKLY_LOSS].enabled:
+        if start_of_week_value <= 0:
             return False
         
-        if start_of_week_value <= 0:
+        if not self.configs[BreakerType.WEEKLY_LOSS].enabled:
             return False
         
-        loss_pct = ((start_of_week_value - current_value) / start_of_week_value) * Decimal("100")
+        loss_pct = ((start_of_week_value - current_value) / start_of_week_value) * _HUNDRED
         threshold = self.configs[BreakerType.WEEKLY_LOSS].threshold
         
         if loss_pct > threshold:
@@ -169,13 +184,13 @@ class CircuitBreaker:
     
     def check_drawdown(self, current_value: Decimal, peak_value: Decimal) -> bool:
         """Check if drawdown from peak exceeded."""
-        if not self.configs[BreakerType.DRAWDOWN].enabled:
+        if peak_value <= 0:
             return False
         
-        if peak_value <= 0:
+        if not self.configs[BreakerType.DRAWDOWN].enabled:
             return False
         
-        drawdown_pct = ((peak_value - current_value) / peak_value) * Decimal("100")
+        drawdown_pct = ((peak_value - current_value) / peak_value) * _HUNDRED
         threshold = self.configs[BreakerType.DRAWDOWN].threshold
         
         if drawdown_pct > threshold:
@@ -257,6 +272,48 @@ class CircuitBreaker:
         
         return False
     
+    def record_trade_results(self, results: Sequence[bool]) -> Optional[int]:
+        """
+        Record a batch of trade results in order.
+        
+        Equivalent to calling record_trade_result for each result, but the
+        consecutive-loss runs are computed in one vectorized pass.
+        
+        Args:
+            results: Trade outcomes in chronological order (True = win)
+        
+        Returns:
+            Index of the first result that tripped the breaker, or None
+        """
+        wins = np.asarray(results, dtype=bool)
+        if wins.size == 0:
+            return None
+        
+        # Length of the losing run ending at each trade; runs that started
+        # before this batch continue from the current counter
+        positions = np.arange(wins.size)
+        last_win = np.maximum.accumulate(np.where(wins, positions, -1))
+        runs = positions - last_win
+        runs[last_win < 0] += self.consecutive_losses
+        
+        self.consecutive_losses = int(runs[-1])
+        
+        if not self.configs[BreakerType.CONSECUTIVE_LOSSES].enabled:
+            return None
+        
+        threshold = int(self.configs[BreakerType.CONSECUTIVE_LOSSES].threshold)
+        
+        trip_indices = np.flatnonzero(~wins & (runs >= threshold))
+        for losses in runs[trip_indices].tolist():
+            self._trip_breaker(
+                BreakerType.CONSECUTIVE_LOSSES,
+                Decimal(threshold),
+                Decimal(losses),
+                f"{losses} consecutive losses exceeds threshold of {threshold}"
+            )
+        
+        return int(trip_indices[0]) if trip_indices.size else None
+    
     def record_api_failure(self) -> bool:
         """
         Record API failure and check threshold.
@@ -294,12 +351,14 @@ class CircuitBreaker:
         message: str
     ) -> None:
         """Internal method to trip a breaker."""
+        now = datetime.now()
         self.states[breaker_type] = BreakerState.OPEN
-        self.trip_times[breaker_type] = datetime.now()
+        self.trip_times[breaker_type] = now
+        self._tripped_mask |= _BREAKER_BITS[breaker_type]
         
         event = BreakerEvent(
             breaker_type=breaker_type,
-            timestamp=datetime.now(),
+            timestamp=now,
             threshold=threshold,
             actual_value=actual_value,
             message=message
@@ -313,15 +372,18 @@ class CircuitBreaker:
         Returns:
             True if trading is allowed, False if any breaker is open
         """
+        if not self._tripped_mask:
+            return True
+        
         # Check if any critical breakers are open
-        for breaker_type, state in self.states.items():
-            if state == BreakerState.OPEN:
-                # Check if cooling period expired
-                if self._is_cooling_period_expired(breaker_type):
-                    self.states[breaker_type] = BreakerState.CLOSED
-                    self.trip_times[breaker_type] = None
-                else:
-                    return False  # Breaker still open
+        for breaker_type in self.get_active_breakers():
+            # Check if cooling period expired
+            if self._is_cooling_period_expired(breaker_type):
+                self.states[breaker_type] = BreakerState.CLOSED
+                self.trip_times[breaker_type] = None
+                self._tripped_mask &= ~_BREAKER_BITS[breaker_type]
+            else:
+                return False  # Breaker still open
         
         return True
     
@@ -338,15 +400,19 @@ class CircuitBreaker:
     
     def get_active_breakers(self) -> List[BreakerType]:
         """Get list of currently active (open) breakers."""
-        return [
-            bt for bt, state in self.states.items()
-            if state == BreakerState.OPEN
-        ]
+        mask = self._tripped_mask
+        if not mask:
+            return []
+        return [bt for bt, bit in _BREAKER_BITS.items() if mask & bit]
     
     def get_recent_events(self, minutes: int = 60) -> List[BreakerEvent]:
         """Get breaker events from last N minutes."""
         cutoff = datetime.now() - timedelta(minutes=minutes)
-        return [e for e in self.events if e.timestamp >= cutoff]
+        # Events are appended in time order: walk back from the newest and
+        # stop at the first one older than the cutoff
+        recent = list(takewhile(lambda e: e.timestamp >= cutoff, reversed(self.events)))
+        recent.reverse()
+        return recent
     
     def manual_reset(self, breaker_type: BreakerType) -> None:
         """
@@ -357,6 +423,7 @@ class CircuitBreaker:
         """
         self.states[breaker_type] = BreakerState.CLOSED
         self.trip_times[breaker_type] = None
+        self._tripped_mask &= ~_BREAKER_BITS[breaker_type]
         
         if breaker_type == BreakerType.CONSECUTIVE_LOSSES:
             self.consecutive_losses = 0
@@ -368,3 +435,10 @@ class CircuitBreaker:
         for breaker_type in BreakerType:
             self.manual_reset(breaker_type)
         self.events.clear()
+    
+    def reset(self) -> None:
+        """Return to the freshly constructed state, keeping configs (for tests/simulations)."""
+        self.reset_all()
+        self.daily_start_value = None
+        self.weekly_start_value = None
+        self.peak_value = None
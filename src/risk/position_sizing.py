@@ -1,9 +1,9 @@
 """Position sizing calculations using Kelly Criterion and risk-based methods."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
+from typing import Optional, Union
 
 
 class AssetTier(Enum):
@@ -43,17 +43,21 @@ class KellyCriterion:
     KELLY_FRACTION = Decimal("0.25")  # Use 25% of full Kelly (conservative)
     MIN_WIN_RATE = Decimal("0.51")  # Below this, don't trade
     MIN_TRADES = 20  # Minimum trades needed for Kelly to be reliable
+    _MIN_WIN_RATE_FLOAT = float(MIN_WIN_RATE)
     
     @staticmethod
     def calculate(
-        win_rate: Decimal,
-        avg_win: Decimal,
-        avg_loss: Decimal,
-        fractional: Optional[Decimal] = None
-    ) -> Decimal:
+        win_rate: Union[Decimal, float],
+        avg_win: Union[Decimal, float],
+        avg_loss: Union[Decimal, float],
+        fractional: Optional[Union[Decimal, float]] = None
+    ) -> Union[Decimal, float]:
         """
         Calculate Kelly Criterion position size.
         
+        A float win_rate takes the float fast path and returns a float;
+        otherwise the calculation is done in Decimal.
+        
         Args:
             win_rate: Historical win rate (0.0 to 1.0)
             avg_win: Average winning trade amount
@@ -65,6 +69,11 @@ class KellyCriterion:
         """
         if fractional is None:
             fractional = KellyCriterion.KELLY_FRACTION
+        
+        if isinstance(win_rate, float):
+            return KellyCriterion._calculate_float(
+                win_rate, float(avg_win), float(avg_loss), float(fractional)
+            )
             
         # Validation
         if win_rate < KellyCriterion.MIN_WIN_RATE:
@@ -87,6 +96,22 @@ class KellyCriterion:
         
         # Never go negative or above 100%
         return max(Decimal("0"), min(fractional_kelly, Decimal("1")))
+    
+    @staticmethod
+    def _calculate_float(
+        win_rate: float,
+        avg_win: float,
+        avg_loss: float,
+        fractional: float
+    ) -> float:
+        """Float counterpart of calculate(), same rules without Decimal overhead."""
+        if win_rate < KellyCriterion._MIN_WIN_RATE_FLOAT or avg_loss == 0 or avg_win <= 0:
+            return 0.0
+        
+        win_loss_ratio = avg_win / avg_loss
+        kelly = (win_rate * win_loss_ratio - (1.0 - win_rate)) / win_loss_ratio
+        
+        return max(0.0, min(kelly * fractional, 1.0))
 
 
 class PositionSizer:
@@ -130,6 +155,21 @@ class PositionSizer:
         if self.params.avg_loss <= 0:
             raise ValueError("Average loss must be positive")
     
+    def with_confidence(self, confidence: Decimal) -> "PositionSizer":
+        """
+        Create a sizer for the same parameters with a different confidence.
+        
+        Shorthand for ``PositionSizer(dataclasses.replace(params, confidence=...))``;
+        the new sizer validates all of its parameters like any other.
+        
+        Args:
+            confidence: AI confidence score 0.0 to 1.0
+        
+        Returns:
+            New position sizer (this one is left unchanged)
+        """
+        return type(self)(replace(self.params, confidence=confidence))
+    
     def calculate_position_size(self) -> Decimal:
         """
         Calculate final position size using multiple methods.
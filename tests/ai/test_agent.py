@@ -9,19 +9,28 @@ from unittest.mock import Mock, patch
 from src.ai import TradingAgent, AnalysisRequest, TradeAction, AssetTier
 
 
+@pytest.fixture(scope="module")
+def mock_genai():
+    """Mock Google Generative AI (patched once for the module)."""
+    with patch('src.ai.agent.genai') as mock:
+        yield mock
+
+
+@pytest.fixture(scope="module")
+def agent(mock_genai):
+    """Create a trading agent with mocked API."""
+    return TradingAgent(api_key="test_key")
+
+
 class TestTradingAgent:
     """Tests for the TradingAgent class."""
     
-    @pytest.fixture
-    def mock_genai(self):
-        """Mock Google Generative AI."""
-        with patch('src.ai.agent.genai') as mock:
-            yield mock
-    
-    @pytest.fixture
-    def agent(self, mock_genai):
-        """Create a trading agent with mocked API."""
-        return TradingAgent(api_key="test_key")
+    @pytest.fixture(autouse=True)
+    def reset_models(self, agent):
+        """Clear recorded model calls between tests sharing the agent."""
+        yield
+        agent.flash_model.generate_content.reset_mock(return_value=True, side_effect=True)
+        agent.pro_model.generate_content.reset_mock(return_value=True, side_effect=True)
     
     @pytest.fixture
     def sample_request(self):
@@ -46,6 +55,16 @@ class TestTradingAgent:
         assert agent.config is not None
         mock_genai.configure.assert_called_once()
     
+    def test_models_created_lazily(self):
+        """Test that each model is only constructed when first used."""
+        with patch('src.ai.agent.genai') as genai:
+            lazy_agent = TradingAgent(api_key="test_key")
+            genai.GenerativeModel.assert_not_called()
+            
+            lazy_agent.flash_model
+            lazy_agent.flash_model
+            genai.GenerativeModel.assert_called_once_with(lazy_agent.config.flash_model)
+    
     def test_build_analysis_prompt(self, agent, sample_request):
         """Test prompt building."""
         prompt = agent._build_analysis_prompt(sample_request)
@@ -78,6 +97,19 @@ class TestTradingAgent:
         assert analysis.entry_price == Decimal("98.50")
         assert "Strong momentum" in analysis.reasoning
     
+    def test_parse_response_with_surrounding_text(self, agent):
+        """Test parsing a fenced JSON block wrapped in extra prose."""
+        response_text = """Here is my analysis:
+```json
+{"action": "SELL", "confidence": 0.6, "reasoning": "Weak volume", "time_horizon": "short"}
+```
+Let me know if you need more detail."""
+        
+        analysis = agent._parse_response(response_text)
+        
+        assert analysis.action == TradeAction.SELL
+        assert analysis.confidence == Decimal("0.6")
+    
     def test_parse_invalid_response_returns_hold(self, agent):
         """Test that invalid response defaults to HOLD."""
         response_text = "Invalid JSON response"
@@ -2,6 +2,7 @@
 Tests for confidence scoring and calibration.
 """
 
+import numpy as np
 import pytest
 from decimal import Decimal
 from datetime import datetime, timedelta
@@ -12,6 +13,14 @@ from src.ai import (
     TradeOutcome
 )
 
+# Loop-invariant values shared by the outcome-recording tests
+_CONF_80 = Decimal("0.80")
+_CONF_30 = Decimal("0.3")
+_PNL_WIN = Decimal("0.05")
+_PNL_LOSS = Decimal("-0.02")
+_PNL_SMALL_WIN = Decimal("0.02")
+_PNL_SMALL_LOSS = Decimal("-0.01")
+
 
 class TestConfidenceFactors:
     """Tests for ConfidenceFactors model."""
@@ -43,6 +52,32 @@ class TestConfidenceFactors:
         
         assert Decimal("0") <= confidence <= Decimal("1")
         assert isinstance(confidence, Decimal)
+    
+    def test_weighted_confidence_batch_matches_scalar(self):
+        """Test batch confidence agrees with the scalar property."""
+        rows = [
+            ("0.80", "0.70", "0.85", "0.75", "0.65"),
+            ("0.10", "0.20", "0.30", "0.40", "0.50"),
+            ("1", "1", "1", "1", "1"),
+        ]
+        factors = [
+            ConfidenceFactors(
+                technical_score=Decimal(t),
+                sentiment_score=Decimal(s),
+                liquidity_score=Decimal(l),
+                risk_reward_score=Decimal(r),
+                historical_accuracy=Decimal(h)
+            )
+            for t, s, l, r, h in rows
+        ]
+        
+        batch = ConfidenceFactors.weighted_confidence_batch(
+            np.array([[float(v) for v in row] for row in rows])
+        )
+        
+        assert batch.shape == (3,)
+        for f, value in zip(factors, batch):
+            assert value == pytest.approx(float(f.weighted_confidence), abs=1e-9)
 
 
 class TestConfidenceScorer:
@@ -101,13 +136,13 @@ class TestConfidenceScorer:
         # Opportunity should be heavily discounted
         assert opp_conf < growth_conf
     
-    def test_record_outcome(self, scorer):
+    def test_record_outcome(self, scorer, fixed_now):
         """Test recording trade outcomes."""
         outcome = TradeOutcome(
             predicted_confidence=Decimal("0.80"),
             actual_success=True,
             profit_loss_pct=Decimal("0.05"),
-            timestamp=datetime.now()
+            timestamp=fixed_now
         )
         
         scorer.record_outcome(outcome.predicted_confidence, outcome.actual_success, outcome.profit_loss_pct)
@@ -127,9 +162,9 @@ class TestConfidenceScorer:
         for i in range(15):
             success = i % 2 == 0
             scorer.record_outcome(
-                Decimal("0.80"),
+                _CONF_80,
                 success,
-                Decimal("0.05") if success else Decimal("-0.02")
+                _PNL_WIN if success else _PNL_LOSS
             )
         
         metrics = scorer.get_calibration_metrics()
@@ -143,9 +178,9 @@ class TestConfidenceScorer:
         # Add enough outcomes (need 10+)
         for i in range(12):
             scorer.record_outcome(
-                Decimal("0.8"),
+                _CONF_80,
                 i % 3 != 0,  # 66% success
-                Decimal("0.05") if i % 3 != 0 else Decimal("-0.02")
+                _PNL_WIN if i % 3 != 0 else _PNL_LOSS
             )
         
         metrics = scorer.get_calibration_metrics()
@@ -154,11 +189,66 @@ class TestConfidenceScorer:
         assert "brier_score" in metrics
         assert 0 <= metrics["brier_score"] <= 1
     
+    def test_calibration_metrics_after_history_trim(self, scorer):
+        """Test that metrics only reflect the retained 1000 trades."""
+        # 5 early losses at 0.3 confidence get trimmed away
+        for _ in range(5):
+            scorer.record_outcome(_CONF_30, False, _PNL_LOSS)
+        for _ in range(1000):
+            scorer.record_outcome(_CONF_80, True, _PNL_SMALL_WIN)
+        
+        metrics = scorer.get_calibration_metrics()
+        
+        assert metrics["total_trades"] == 1000
+        assert metrics["overall_success_rate"] == 1.0
+        assert [b["count"] for b in metrics["bins"]] == [1000]
+    
+    def test_record_outcomes_bulk(self, scorer, fixed_now):
+        """Test bulk recording matches the per-record path."""
+        outcomes = [
+            TradeOutcome(
+                predicted_confidence=_CONF_80,
+                actual_success=i % 5 != 0,
+                profit_loss_pct=_PNL_SMALL_WIN if i % 5 != 0 else _PNL_SMALL_LOSS,
+                timestamp=fixed_now
+            )
+            for i in range(100)
+        ]
+        
+        scorer.record_outcomes_bulk(outcomes)
+        
+        reference = ConfidenceScorer()
+        for outcome in outcomes:
+            reference.record_outcome(
+                outcome.predicted_confidence,
+                outcome.actual_success,
+                outcome.profit_loss_pct
+            )
+        
+        assert len(scorer.trade_history) == 100
+        assert scorer.get_calibration_metrics() == reference.get_calibration_metrics()
+    
+    def test_record_outcomes_bulk_keeps_history_sorted(self, scorer):
+        """Test backfilled older outcomes are merged in timestamp order."""
+        for _ in range(5):
+            scorer.record_outcome(_CONF_80, True, _PNL_SMALL_WIN)
+        old = TradeOutcome(
+            predicted_confidence=_CONF_80,
+            actual_success=False,
+            profit_loss_pct=_PNL_SMALL_LOSS,
+            timestamp=datetime.now() - timedelta(days=30)
+        )
+        
+        scorer.record_outcomes_bulk([old])
+        
+        assert scorer.trade_history[0] is old
+        assert scorer.get_recent_accuracy(days=7) == Decimal("1")
+    
     def test_get_recent_accuracy(self, scorer):
         """Test getting recent accuracy."""
         # Add some recent outcomes
         for i in range(5):
-            scorer.record_outcome(Decimal("0.80"), i < 4, Decimal("0.02"))
+            scorer.record_outcome(_CONF_80, i < 4, _PNL_SMALL_WIN)
         
         accuracy = scorer.get_recent_accuracy(days=7)
         
@@ -166,6 +256,20 @@ class TestConfidenceScorer:
         assert accuracy is not None
         assert accuracy == pytest.approx(Decimal("0.80"), abs=0.01)
     
+    def test_get_recent_accuracy_excludes_old_trades(self, scorer):
+        """Test that trades outside the window are ignored."""
+        # 3 old losses followed by 5 recent wins
+        for i in range(8):
+            scorer.record_outcome(_CONF_80, i >= 3, _PNL_SMALL_WIN)
+        
+        old_time = datetime.now() - timedelta(days=30)
+        for outcome in scorer.trade_history[:3]:
+            outcome.timestamp = old_time
+        
+        accuracy = scorer.get_recent_accuracy(days=7)
+        
+        assert accuracy == Decimal("1")
+    
     def test_get_recent_accuracy_no_history(self, scorer):
         """Test recent accuracy with no history."""
         accuracy = scorer.get_recent_accuracy(days=7)
@@ -178,7 +282,7 @@ class TestConfidenceScorer:
         for i in range(50):
             # Simulate 80% success rate
             success = i % 5 != 0
-            scorer.record_outcome(Decimal("0.80"), success, Decimal("0.02") if success else Decimal("-0.01"))
+            scorer.record_outcome(_CONF_80, success, _PNL_SMALL_WIN if success else _PNL_SMALL_LOSS)
         
         # Calculate confidence should still work
         confidence = scorer.calculate_confidence(base_factors, "FOUNDATION")
@@ -3,17 +3,55 @@ Tests for trade memory and pattern matching.
 """
 
 import pytest
+from dataclasses import dataclass, field
 from decimal import Decimal
-from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 
+from pydantic import ValidationError
+
 from src.ai.memory import TradeMemory, TradePattern
 
 
+@dataclass
+class FakeMatch:
+    """Plain stand-in for a Pinecone query match."""
+    metadata: dict
+
+
+@dataclass
+class FakeResponse:
+    """Plain stand-in for a Pinecone query response."""
+    matches: list = field(default_factory=list)
+
+
+@pytest.fixture(scope="module")
+def mock_pinecone():
+    """Mock Pinecone client (patched once for the module)."""
+    with patch('src.ai.memory.pinecone') as mock:
+        # Mock index
+        mock_index = MagicMock()
+        mock.Index.return_value = mock_index
+        mock.list_indexes.return_value = []  # Index doesn't exist yet
+        yield mock, mock_index
+
+
+@pytest.fixture
+def memory(mock_pinecone):
+    """Create trade memory on the shared Pinecone mock, with its call history cleared."""
+    mock_client, mock_index = mock_pinecone
+    mock_client.reset_mock()
+    mock_index.reset_mock(return_value=True, side_effect=True)
+    return TradeMemory(
+        api_key="test_key",
+        environment="test",
+        index_name="test-index"
+    )
+
+
 class TestTradePattern:
     """Tests for TradePattern model."""
     
-    def test_create_valid_pattern(self):
+    def test_create_valid_pattern(self, fixed_now):
         """Test creating a valid trade pattern."""
         pattern = TradePattern(
             trade_id="test_123",
@@ -22,14 +60,14 @@ class TestTradePattern:
             action="BUY",
             confidence=Decimal("0.85"),
             reasoning="Test reasoning",
-            timestamp=datetime.now()
+            timestamp=fixed_now
         )
         
         assert pattern.trade_id == "test_123"
         assert pattern.symbol == "SOL"
         assert pattern.action == "BUY"
     
-    def test_pattern_with_outcome(self):
+    def test_pattern_with_outcome(self, fixed_now):
         """Test pattern with trade outcome."""
         pattern = TradePattern(
             trade_id="test_123",
@@ -41,40 +79,36 @@ class TestTradePattern:
             action="BUY",
             confidence=Decimal("0.80"),
             reasoning="Strong fundamentals",
-            timestamp=datetime.now(),
+            timestamp=fixed_now,
             max_drawdown=Decimal("0.02"),
             holding_period_hours=48
         )
         
         assert pattern.success is True
         assert pattern.profit_loss_pct == Decimal("0.04")
+    
+    def test_pattern_is_frozen(self, fixed_now):
+        """Test that patterns are immutable and hashable."""
+        pattern = TradePattern(
+            trade_id="test_123",
+            symbol="SOL",
+            entry_price=Decimal("98.50"),
+            action="BUY",
+            confidence=Decimal("0.85"),
+            reasoning="Test reasoning",
+            timestamp=fixed_now
+        )
+        
+        with pytest.raises(ValidationError):
+            pattern.success = True
+        assert {pattern: 1}[pattern] == 1
 
 
 class TestTradeMemory:
     """Tests for the TradeMemory class."""
     
     @pytest.fixture
-    def mock_pinecone(self):
-        """Mock Pinecone client."""
-        with patch('src.ai.memory.pinecone') as mock:
-            # Mock index
-            mock_index = MagicMock()
-            mock.Index.return_value = mock_index
-            mock.list_indexes.return_value = []  # Index doesn't exist yet
-            yield mock, mock_index
-    
-    @pytest.fixture
-    def memory(self, mock_pinecone):
-        """Create trade memory with mocked Pinecone."""
-        mock_client, mock_index = mock_pinecone
-        return TradeMemory(
-            api_key="test_key",
-            environment="test",
-            index_name="test-index"
-        )
-    
-    @pytest.fixture
-    def sample_pattern(self):
+    def sample_pattern(self, fixed_now):
         """Create a sample trade pattern."""
         return TradePattern(
             trade_id="trade_123",
@@ -83,7 +117,7 @@ class TestTradeMemory:
             action="BUY",
             confidence=Decimal("0.85"),
             reasoning="Strong momentum with bullish indicators",
-            timestamp=datetime.now(),
+            timestamp=fixed_now,
             rsi=Decimal("62.5"),
             volume_24h=Decimal("1500000000"),
             market_cap=Decimal("45000000000")
@@ -124,6 +158,30 @@ class TestTradeMemory:
         assert len(vectors[0][1]) == 384  # embedding
         assert "symbol" in vectors[0][2]  # metadata
     
+    def test_store_trades_bulk(self, memory, sample_pattern, sample_embedding, mock_pinecone):
+        """Test that bulk storage batches vectors into a single upsert."""
+        mock_client, mock_index = mock_pinecone
+        patterns = [
+            sample_pattern.model_copy(update={"trade_id": f"trade_{i}"})
+            for i in range(100)
+        ]
+        
+        memory.store_trades_bulk(patterns, [sample_embedding] * 100)
+        
+        mock_index.upsert.assert_called_once()
+        vectors = mock_index.upsert.call_args[1]["vectors"]
+        assert [v[0] for v in vectors] == [f"trade_{i}" for i in range(100)]
+        assert isinstance(vectors[0][2]["entry_price"], float)
+    
+    def test_store_trades_bulk_chunks_batches(self, memory, sample_pattern, sample_embedding, mock_pinecone):
+        """Test that inputs above the batch size are split across upserts."""
+        mock_client, mock_index = mock_pinecone
+        
+        memory.store_trades_bulk([sample_pattern] * 250, [sample_embedding] * 250)
+        
+        sizes = [len(c[1]["vectors"]) for c in mock_index.upsert.call_args_list]
+        assert sizes == [100, 100, 50]
+    
     def test_store_trade_converts_decimals(self, memory, sample_pattern, sample_embedding, mock_pinecone):
         """Test that Decimal values are converted to float for storage."""
         mock_client, mock_index = mock_pinecone
@@ -140,26 +198,53 @@ class TestTradeMemory:
         assert isinstance(metadata["entry_price"], float)
         assert isinstance(metadata["confidence"], float)
     
-    def test_find_similar_trades(self, memory, sample_embedding, mock_pinecone):
+    def test_store_trade_timestamp_as_epoch(self, memory, sample_pattern, sample_embedding, mock_pinecone):
+        """Test that timestamps are stored as epoch seconds."""
+        mock_client, mock_index = mock_pinecone
+        
+        memory.store_trade(
+            pattern=sample_pattern,
+            embedding=sample_embedding
+        )
+        
+        metadata = mock_index.upsert.call_args[1]["vectors"][0][2]
+        assert metadata["timestamp"] == sample_pattern.timestamp.timestamp()
+    
+    def test_find_similar_trades_legacy_iso_timestamp(self, memory, sample_embedding, mock_pinecone, fixed_now):
+        """Test that records stored with ISO timestamps still parse."""
+        mock_client, mock_index = mock_pinecone
+        mock_index.query.return_value = FakeResponse(matches=[FakeMatch(metadata={
+            "trade_id": "trade_old",
+            "symbol": "SOL",
+            "entry_price": 98.50,
+            "action": "BUY",
+            "confidence": 0.85,
+            "reasoning": "Test",
+            "timestamp": fixed_now.isoformat()
+        })])
+        
+        similar = memory.find_similar_trades(query_embedding=sample_embedding)
+        
+        assert len(similar) == 1
+        assert similar[0].timestamp == fixed_now
+    
+    def test_find_similar_trades(self, memory, sample_embedding, mock_pinecone, fixed_now):
         """Test finding similar trades."""
         mock_client, mock_index = mock_pinecone
         
         # Create mock match object
-        mock_match = MagicMock()
-        mock_match.metadata = {
+        mock_match = FakeMatch(metadata={
             "trade_id": "trade_123",
             "symbol": "SOL",
             "entry_price": 98.50,
             "action": "BUY",
             "confidence": 0.85,
             "reasoning": "Test",
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": fixed_now.timestamp()
+        })
         
         # Mock query response
-        mock_response = MagicMock()
-        mock_response.matches = [mock_match]
-        mock_index.query.return_value = mock_response
+        mock_index.query.return_value = FakeResponse(matches=[mock_match])
         
         similar = memory.find_similar_trades(
             query_embedding=sample_embedding,
@@ -181,9 +266,7 @@ class TestTradeMemory:
     def test_find_similar_trades_with_filters(self, memory, sample_embedding, mock_pinecone):
         """Test finding similar trades with filters."""
         mock_client, mock_index = mock_pinecone
-        mock_response = MagicMock()
-        mock_response.matches = []
-        mock_index.query.return_value = mock_response
+        mock_index.query.return_value = FakeResponse()
         
         # Find with symbol and confidence filter
         memory.find_similar_trades(
@@ -201,9 +284,7 @@ class TestTradeMemory:
     def test_find_similar_trades_empty(self, memory, sample_embedding, mock_pinecone):
         """Test finding similar trades with no matches."""
         mock_client, mock_index = mock_pinecone
-        mock_response = MagicMock()
-        mock_response.matches = []
-        mock_index.query.return_value = mock_response
+        mock_index.query.return_value = FakeResponse()
         
         similar = memory.find_similar_trades(
             query_embedding=sample_embedding
@@ -223,18 +304,85 @@ class TestTradeMemory:
         
         assert similar == []
     
-    def test_update_trade_outcome(self, memory, mock_pinecone):
-        """Test updating trade outcome."""
+    def test_find_similar_trades_local(self, memory, sample_pattern, mock_pinecone):
+        """Test that warm probes are served from the local cache without a query."""
+        mock_client, mock_index = mock_pinecone
+        
+        near = sample_pattern.model_copy(update={"trade_id": "near"})
+        far = sample_pattern.model_copy(update={"trade_id": "far"})
+        other = sample_pattern.model_copy(update={"trade_id": "other"})
+        memory.store_trades_bulk(
+            [far, near, other],
+            [[1.0, 0.0] + [0.0] * 382, [0.0, 1.0] + [0.0] * 382, [0.0, 0.0, 1.0] + [0.0] * 381]
+        )
+        
+        similar = memory.find_similar_trades_local([0.1, 0.9] + [0.0] * 382, k=2)
+        
+        assert [p.trade_id for p in similar] == ["near", "far"]
+        mock_index.query.assert_not_called()
+    
+    def test_find_similar_trades_local_falls_back_when_empty(self, memory, sample_embedding, mock_pinecone):
+        """Test that an empty cache falls back to a Pinecone query."""
+        mock_client, mock_index = mock_pinecone
+        mock_index.query.return_value = FakeResponse()
+        
+        similar = memory.find_similar_trades_local(sample_embedding, k=5)
+        
+        assert similar == []
+        mock_index.query.assert_called_once()
+    
+    def test_find_similar_trades_local_applies_filters(self, memory, sample_pattern, sample_embedding, mock_pinecone):
+        """Test that symbol and min_confidence filter the cached trades like the index query."""
         mock_client, mock_index = mock_pinecone
         
-        # Mock fetch to return existing trade
-        mock_vector = MagicMock()
-        mock_vector.metadata = {"symbol": "SOL", "action": "BUY"}
-        mock_vector.values = [0.1] * 384
+        sol_high = sample_pattern.model_copy(update={"trade_id": "sol_high"})
+        sol_low = sample_pattern.model_copy(update={"trade_id": "sol_low", "confidence": Decimal("0.40")})
+        btc_high = sample_pattern.model_copy(update={"trade_id": "btc_high", "symbol": "BTC"})
+        memory.store_trades_bulk([sol_high, sol_low, btc_high], [sample_embedding] * 3)
+        
+        by_symbol = memory.find_similar_trades_local(sample_embedding, symbol="SOL")
+        by_both = memory.find_similar_trades_local(
+            sample_embedding, symbol="SOL", min_confidence=Decimal("0.5")
+        )
+        no_match = memory.find_similar_trades_local(sample_embedding, symbol="ETH")
         
-        mock_response = MagicMock()
-        mock_response.vectors = {"trade_123": mock_vector}
-        mock_index.fetch.return_value = mock_response
+        assert {p.trade_id for p in by_symbol} == {"sol_high", "sol_low"}
+        assert [p.trade_id for p in by_both] == ["sol_high"]
+        assert no_match == []
+        mock_index.query.assert_not_called()
+    
+    def test_local_cache_evicts_oldest_trades(self, sample_pattern):
+        """Test that a full local cache drops its oldest trades first."""
+        # Own Pinecone mock, so this extra client leaves the shared one untouched
+        with patch('src.ai.memory.pinecone'):
+            small_memory = TradeMemory(api_key="test_key", max_cached_trades=2)
+        unit = [1.0] + [0.0] * 383
+        
+        for trade_id in ["first", "second"]:
+            small_memory.store_trade(sample_pattern.model_copy(update={"trade_id": trade_id}), unit)
+        # Re-storing a cached trade replaces it in place instead of evicting
+        small_memory.store_trade(sample_pattern.model_copy(update={"trade_id": "first"}), unit)
+        small_memory.store_trade(sample_pattern.model_copy(update={"trade_id": "third"}), unit)
+        
+        similar = small_memory.find_similar_trades_local(unit, k=5)
+        
+        assert {p.trade_id for p in similar} == {"second", "third"}
+    
+    def test_store_trade_rejects_wrong_dimension(self, memory, sample_pattern, mock_pinecone):
+        """Test that a wrongly sized embedding raises before anything is stored."""
+        mock_client, mock_index = mock_pinecone
+        
+        with pytest.raises(ValueError, match="shape"):
+            memory.store_trade(sample_pattern, [0.1] * 10)
+        with pytest.raises(ValueError, match="shape"):
+            memory.store_trades_bulk([sample_pattern], [[0.1] * 385])
+        
+        mock_index.upsert.assert_not_called()
+        assert memory._trade_ids == []
+    
+    def test_update_trade_outcome(self, memory, mock_pinecone):
+        """Test updating trade outcome."""
+        mock_client, mock_index = mock_pinecone
         
         memory.update_trade_outcome(
             trade_id="trade_123",
@@ -245,22 +393,24 @@ class TestTradeMemory:
             holding_period_hours=48
         )
         
-        # Should fetch the trade
-        mock_index.fetch.assert_called_once_with(ids=["trade_123"])
-        
-        # Should upsert with updated metadata
-        mock_index.upsert.assert_called_once()
-        call_args = mock_index.upsert.call_args[1]
-        updated_metadata = call_args["vectors"][0][2]
-        assert updated_metadata["exit_price"] == 105.00
-        assert updated_metadata["success"] is True
+        # Should update metadata in place without fetching or re-upserting
+        mock_index.update.assert_called_once_with(
+            id="trade_123",
+            set_metadata={
+                "exit_price": 105.00,
+                "profit_loss_pct": 0.066,
+                "success": True,
+                "max_drawdown": 0.02,
+                "holding_period_hours": 48
+            }
+        )
+        mock_index.fetch.assert_not_called()
+        mock_index.upsert.assert_not_called()
     
     def test_update_trade_outcome_not_found(self, memory, mock_pinecone):
         """Test updating outcome for non-existent trade."""
         mock_client, mock_index = mock_pinecone
-        mock_response = MagicMock()
-        mock_response.vectors = {}
-        mock_index.fetch.return_value = mock_response
+        mock_index.update.side_effect = Exception("Vector nonexistent not found")
         
         # Should not raise error
         memory.update_trade_outcome(
@@ -272,10 +422,10 @@ class TestTradeMemory:
             holding_period_hours=24
         )
         
-        # Should not call upsert
+        mock_index.update.assert_called_once()
         mock_index.upsert.assert_not_called()
     
-    def test_get_success_rate_for_pattern(self, memory, sample_embedding, mock_pinecone):
+    def test_get_success_rate_for_pattern(self, memory, sample_embedding, mock_pinecone, fixed_now):
         """Test getting success rate for similar patterns (needs 5+ closed trades)."""
         mock_client, mock_index = mock_pinecone
         
@@ -283,23 +433,20 @@ class TestTradeMemory:
         matches = []
         outcomes = [(True, 0.05), (False, -0.02), (True, 0.03), (True, 0.04), (False, -0.01)]
         for i, (success, pnl) in enumerate(outcomes):
-            mock_match = MagicMock()
-            mock_match.metadata = {
+            mock_match = FakeMatch(metadata={
                 "trade_id": f"trade_{i}",
                 "symbol": "SOL",
                 "entry_price": 98.0,
                 "action": "BUY",
                 "confidence": 0.85,
                 "reasoning": "Test",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": fixed_now.timestamp(),
                 "success": success,
                 "profit_loss_pct": pnl
-            }
+            })
             matches.append(mock_match)
         
-        mock_response = MagicMock()
-        mock_response.matches = matches
-        mock_index.query.return_value = mock_response
+        mock_index.query.return_value = FakeResponse(matches=matches)
         
         success_rate = memory.get_success_rate_for_pattern(
             query_embedding=sample_embedding,
@@ -309,30 +456,56 @@ class TestTradeMemory:
         # Should calculate correct success rate (3 out of 5 = 60%)
         assert success_rate == pytest.approx(Decimal("0.60"), abs=0.01)
     
-    def test_get_success_rate_insufficient_data(self, memory, sample_embedding, mock_pinecone):
+    def test_get_success_rate_with_prefetched_patterns(self, memory, sample_embedding, mock_pinecone, fixed_now):
+        """Test success rate reuses already-fetched patterns without querying."""
+        mock_client, mock_index = mock_pinecone
+        
+        entry_price = Decimal("98.0")
+        confidence = Decimal("0.85")
+        patterns = [
+            TradePattern(
+                trade_id=f"trade_{i}",
+                symbol="SOL",
+                entry_price=entry_price,
+                action="BUY",
+                confidence=confidence,
+                reasoning="Test",
+                timestamp=fixed_now,
+                success=success
+            )
+            for i, success in enumerate([True, False, True, True, False, None])
+        ]
+        
+        success_rate = memory.get_success_rate_for_pattern(
+            query_embedding=sample_embedding,
+            patterns=patterns
+        )
+        
+        # Open trade (success=None) is ignored: 3 out of 5 closed
+        assert success_rate == Decimal("0.6")
+        mock_index.query.assert_not_called()
+    
+    def test_get_success_rate_insufficient_data(self, memory, sample_embedding, mock_pinecone, fixed_now):
         """Test success rate with insufficient completed trades (< 5)."""
         mock_client, mock_index = mock_pinecone
         
         # Create only 3 matches (less than minimum of 5)
         matches = []
         for i in range(3):
-            mock_match = MagicMock()
-            mock_match.metadata = {
+            mock_match = FakeMatch(metadata={
                 "trade_id": f"trade_{i}",
                 "symbol": "SOL",
                 "entry_price": 98.0,
                 "action": "BUY",
                 "confidence": 0.85,
                 "reasoning": "Test",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": fixed_now.timestamp(),
                 "success": True,
                 "profit_loss_pct": 0.05
-            }
+            })
             matches.append(mock_match)
         
-        mock_response = MagicMock()
-        mock_response.matches = matches
-        mock_index.query.return_value = mock_response
+        mock_index.query.return_value = FakeResponse(matches=matches)
         
         success_rate = memory.get_success_rate_for_pattern(
             query_embedding=sample_embedding
@@ -1,65 +1,80 @@
 """Pytest configuration and fixtures for testing."""
 
+import os
+
 import pytest
 from decimal import Decimal
 from datetime import datetime
+from hypothesis import settings
+
+# Under pytest-xdist, keep workers from contending on the shared Hypothesis
+# example database (derandomized property tests already run without one)
+settings.register_profile("xdist", database=None)
+if os.environ.get("PYTEST_XDIST_WORKER"):
+    settings.load_profile("xdist")
+
+
+@pytest.fixture(scope="session")
+def fixed_now():
+    """Frozen timestamp for tests that don't depend on the real clock."""
+    return datetime(2024, 1, 15, 12, 0, 0)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_portfolio_value():
     """Standard portfolio value for testing."""
     return Decimal("10000")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_win_rate():
     """Sample win rate (60%)."""
     return Decimal("0.60")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_avg_win():
     """Sample average win amount."""
     return Decimal("100")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_avg_loss():
     """Sample average loss amount."""
     return Decimal("50")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_confidence():
     """Sample AI confidence score (80%)."""
     return Decimal("0.80")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def high_confidence():
     """High AI confidence score (95%)."""
     return Decimal("0.95")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def low_confidence():
     """Low AI confidence score (55%)."""
     return Decimal("0.55")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_entry_price():
     """Sample entry price for a trade."""
     return Decimal("100.00")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_take_profit():
     """Sample take profit price."""
     return Decimal("120.00")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_stop_loss():
     """Sample stop loss price."""
     return Decimal("95.00")
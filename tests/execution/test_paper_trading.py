@@ -10,6 +10,31 @@ from src.execution.paper_trading import (
     PaperTrade
 )
 
+# Frequently used values, parsed once per module
+_D50000 = Decimal("50000")
+_D10000 = Decimal("10000")
+_D200 = Decimal("200")
+_D190 = Decimal("190")
+_D110 = Decimal("110")
+_D105 = Decimal("105")
+_D100 = Decimal("100")
+_D95 = Decimal("95")
+_D10 = Decimal("10")
+_D5 = Decimal("5")
+_D1 = Decimal("1")
+_FEE_RATE = Decimal("0.001")
+_TOLERANCE = Decimal("0.01")
+
+
+@pytest.fixture(scope="class")
+def engine():
+    """Create engine for testing (shared per class, reset per test)."""
+    return PaperTradingEngine(
+        initial_capital=_D10000,
+        fee_rate=_FEE_RATE,
+        slippage_rate=Decimal("0.002")
+    )
+
 
 class TestPaperPosition:
     """Test PaperPosition model."""
@@ -18,10 +43,10 @@ class TestPaperPosition:
         """Test cost basis calculation."""
         position = PaperPosition(
             symbol="SOL",
-            entry_price=Decimal("100"),
-            quantity=Decimal("10"),
+            entry_price=_D100,
+            quantity=_D10,
             entry_time=datetime.now(),
-            fees_paid=Decimal("5")
+            fees_paid=_D5
         )
         
         assert position.cost_basis == Decimal("1005")  # 100 * 10 + 5
@@ -30,19 +55,19 @@ class TestPaperPosition:
         """Test unrealized P/L calculation."""
         position = PaperPosition(
             symbol="SOL",
-            entry_price=Decimal("100"),
-            quantity=Decimal("10"),
+            entry_price=_D100,
+            quantity=_D10,
             entry_time=datetime.now(),
-            fees_paid=Decimal("5")
+            fees_paid=_D5
         )
         
         # Price up 10%
-        current_price = Decimal("110")
+        current_price = _D110
         pnl = position.unrealized_pnl(current_price)
-        assert pnl == Decimal("95")  # 1100 - 1005
+        assert pnl == _D95  # 1100 - 1005
         
         # Price down 5%
-        current_price = Decimal("95")
+        current_price = _D95
         pnl = position.unrealized_pnl(current_price)
         assert pnl == Decimal("-55")  # 950 - 1005
     
@@ -50,45 +75,56 @@ class TestPaperPosition:
         """Test unrealized P/L percentage."""
         position = PaperPosition(
             symbol="SOL",
-            entry_price=Decimal("100"),
-            quantity=Decimal("10"),
+            entry_price=_D100,
+            quantity=_D10,
             entry_time=datetime.now(),
-            fees_paid=Decimal("5")
+            fees_paid=_D5
         )
         
         # Price up 10%
-        current_price = Decimal("110")
+        current_price = _D110
         pnl_pct = position.unrealized_pnl_pct(current_price)
-        assert abs(pnl_pct - Decimal("9.45")) < Decimal("0.01")  # ~9.45%
+        assert pnl_pct == pytest.approx(Decimal("9.45"), abs=_TOLERANCE)  # ~9.45%
 
 
 class TestPaperTradingEngine:
     """Test paper trading engine."""
     
-    @pytest.fixture
-    def engine(self):
-        """Create engine for testing."""
-        return PaperTradingEngine(
-            initial_capital=Decimal("10000"),
-            fee_rate=Decimal("0.001"),
-            slippage_rate=Decimal("0.002")
-        )
+    @pytest.fixture(autouse=True)
+    def reset_engine(self, engine):
+        """Start every test from a clean engine without rebuilding it."""
+        engine.reset()
+        yield
     
     def test_initialization(self, engine):
         """Test engine initialization."""
-        assert engine.initial_capital == Decimal("10000")
-        assert engine.cash == Decimal("10000")
+        assert engine.initial_capital == _D10000
+        assert engine.cash == _D10000
+        assert len(engine.positions) == 0
+        assert len(engine.closed_trades) == 0
+    
+    def test_reset(self, engine):
+        """Test reset restores the initial state."""
+        engine.execute_buy("SOL", _D10, _D100, stop_loss=_D95)
+        engine.execute_buy("ETH", _D5, _D200)
+        engine.execute_sell("ETH", Decimal("210"))
+        
+        engine.reset()
+        
+        assert engine.cash == _D10000
         assert len(engine.positions) == 0
         assert len(engine.closed_trades) == 0
+        assert engine.daily_pnl == {}
+        assert engine.update_positions({"SOL": Decimal("90")}) == []
     
     def test_execute_buy_success(self, engine):
         """Test successful buy execution."""
         success = engine.execute_buy(
             symbol="SOL",
-            quantity=Decimal("10"),
-            price=Decimal("100"),
-            stop_loss=Decimal("95"),
-            take_profit=Decimal("110")
+            quantity=_D10,
+            price=_D100,
+            stop_loss=_D95,
+            take_profit=_D110
         )
         
         assert success is True
@@ -96,41 +132,53 @@ class TestPaperTradingEngine:
         
         position = engine.positions["SOL"]
         assert position.symbol == "SOL"
-        assert position.quantity == Decimal("10")
+        assert position.quantity == _D10
         
         # Check slippage applied (buy at 100.2)
         assert position.entry_price == Decimal("100.2")
         
         # Check cash deducted (100.2 * 10 * 1.001 = 1003.002)
-        expected_cash = Decimal("10000") - Decimal("1003.002")
-        assert abs(engine.cash - expected_cash) < Decimal("0.01")
+        expected_cash = _D10000 - Decimal("1003.002")
+        assert engine.cash == pytest.approx(expected_cash, abs=_TOLERANCE)
+    
+    def test_execute_buys(self, engine):
+        """Test bulk buys share one fill time and stop on insufficient cash."""
+        results = engine.execute_buys([
+            ("SOL", _D10, _D100),
+            ("ETH", _D5, _D200),
+            ("BTC", _D1, _D50000),
+        ])
+        
+        assert results == [True, True, False]
+        assert list(engine.positions) == ["SOL", "ETH"]
+        assert engine.positions["SOL"].entry_time == engine.positions["ETH"].entry_time
     
     def test_execute_buy_insufficient_cash(self, engine):
         """Test buy with insufficient cash."""
         success = engine.execute_buy(
             symbol="SOL",
             quantity=Decimal("1000"),  # Way too much
-            price=Decimal("100")
+            price=_D100
         )
         
         assert success is False
         assert len(engine.positions) == 0
-        assert engine.cash == Decimal("10000")  # Unchanged
+        assert engine.cash == _D10000  # Unchanged
     
     def test_execute_buy_duplicate_position(self, engine):
         """Test buying same symbol twice."""
         # First buy
         engine.execute_buy(
             symbol="SOL",
-            quantity=Decimal("10"),
-            price=Decimal("100")
+            quantity=_D10,
+            price=_D100
         )
         
         # Second buy (should fail)
         success = engine.execute_buy(
             symbol="SOL",
-            quantity=Decimal("5"),
-            price=Decimal("100")
+            quantity=_D5,
+            price=_D100
         )
         
         assert success is False
@@ -140,9 +188,9 @@ class TestPaperTradingEngine:
         """Test buy with invalid stop loss (above entry)."""
         success = engine.execute_buy(
             symbol="SOL",
-            quantity=Decimal("10"),
-            price=Decimal("100"),
-            stop_loss=Decimal("105")  # Above entry!
+            quantity=_D10,
+            price=_D100,
+            stop_loss=_D105  # Above entry!
         )
         
         assert success is False
@@ -152,9 +200,9 @@ class TestPaperTradingEngine:
         """Test buy with invalid take profit (below entry)."""
         success = engine.execute_buy(
             symbol="SOL",
-            quantity=Decimal("10"),
-            price=Decimal("100"),
-            take_profit=Decimal("95")  # Below entry!
+            quantity=_D10,
+            price=_D100,
+            take_profit=_D95  # Below entry!
         )
         
         assert success is False
@@ -165,8 +213,8 @@ class TestPaperTradingEngine:
         # First buy
         engine.execute_buy(
             symbol="SOL",
-            quantity=Decimal("10"),
-            price=Decimal("100")
+            quantity=_D10,
+            price=_D100
         )
         
         initial_cash = engine.cash
@@ -174,7 +222,7 @@ class TestPaperTradingEngine:
         # Then sell at profit
         trade = engine.execute_sell(
             symbol="SOL",
-            current_price=Decimal("110"),
+            current_price=_D110,
             exit_reason="manual"
         )
         
@@ -189,7 +237,7 @@ class TestPaperTradingEngine:
         """Test sell without position."""
         trade = engine.execute_sell(
             symbol="SOL",
-            current_price=Decimal("110")
+            current_price=_D110
         )
         
         assert trade is None
@@ -200,17 +248,17 @@ class TestPaperTradingEngine:
         # Buy with stop loss
         engine.execute_buy(
             symbol="SOL",
-            quantity=Decimal("10"),
-            price=Decimal("100"),
-            stop_loss=Decimal("95")
+            quantity=_D10,
+            price=_D100,
+            stop_loss=_D95
         )
         
         # Price drops to stop loss
-        exit_reason = engine.check_stop_loss_take_profit("SOL", Decimal("95"))
+        exit_reason = engine.check_stop_loss_take_profit("SOL", _D95)
         assert exit_reason == "stop_loss"
         
         # Update positions (should trigger stop)
-        market_prices = {"SOL": Decimal("95")}
+        market_prices = {"SOL": _D95}
         closed_trades = engine.update_positions(market_prices)
         
         assert len(closed_trades) == 1
@@ -222,23 +270,84 @@ class TestPaperTradingEngine:
         # Buy with take profit
         engine.execute_buy(
             symbol="SOL",
-            quantity=Decimal("10"),
-            price=Decimal("100"),
-            take_profit=Decimal("110")
+            quantity=_D10,
+            price=_D100,
+            take_profit=_D110
         )
         
         # Price rises to take profit
-        exit_reason = engine.check_stop_loss_take_profit("SOL", Decimal("110"))
+        exit_reason = engine.check_stop_loss_take_profit("SOL", _D110)
         assert exit_reason == "take_profit"
         
         # Update positions (should trigger TP)
-        market_prices = {"SOL": Decimal("110")}
+        market_prices = {"SOL": _D110}
         closed_trades = engine.update_positions(market_prices)
         
         assert len(closed_trades) == 1
         assert closed_trades[0].exit_reason == "take_profit"
         assert closed_trades[0].pnl > 0  # Profit
     
+    def test_update_positions_closes_only_triggered(self, engine):
+        """Test that one update closes triggered positions and keeps the rest."""
+        engine.execute_buy("SOL", _D10, _D100, stop_loss=_D95)
+        engine.execute_buy("ETH", _D5, _D200, take_profit=Decimal("220"))
+        engine.execute_buy("ADA", _D100, _D1, stop_loss=Decimal("0.9"))
+        
+        closed_trades = engine.update_positions({
+            "SOL": Decimal("94"),
+            "ETH": Decimal("225"),
+            "ADA": Decimal("0.95")
+        })
+        
+        assert [t.symbol for t in closed_trades] == ["SOL", "ETH"]
+        assert [t.exit_reason for t in closed_trades] == ["stop_loss", "take_profit"]
+        assert list(engine.positions) == ["ADA"]
+        
+        # Remaining position still triggers on a later tick
+        closed_trades = engine.update_positions({"ADA": Decimal("0.9")})
+        assert [t.symbol for t in closed_trades] == ["ADA"]
+    
+    def test_update_positions_after_many_opens_and_closes(self, engine):
+        """Test triggers close in opening order after many opens and closes."""
+        symbols = [f"T{i}" for i in range(40)]
+        for symbol in symbols:
+            engine.execute_buy(symbol, _D1, _D10, stop_loss=_D5)
+        for symbol in symbols[::3]:
+            engine.execute_sell(symbol, _D10)
+        
+        open_symbols = [s for i, s in enumerate(symbols) if i % 3]
+        triggered = open_symbols[::2]
+        prices = {s: Decimal("4") if s in triggered else _D10 for s in open_symbols}
+        closed_trades = engine.update_positions(prices)
+        
+        assert [t.symbol for t in closed_trades] == triggered
+        assert list(engine.positions) == open_symbols[1::2]
+    
+    def test_update_positions_sees_stops_edited_in_place(self, engine):
+        """Test a stop loss moved on the open position (trailing stop) triggers."""
+        engine.execute_buy("SOL", _D10, _D100, stop_loss=_D95)
+        engine.positions["SOL"].stop_loss = _D105
+        
+        closed_trades = engine.update_positions({"SOL": _D105})
+        
+        assert [t.exit_reason for t in closed_trades] == ["stop_loss"]
+    
+    def test_positions_assigned_directly_are_scanned(self, engine):
+        """Test positions set through the mapping still trigger exits."""
+        engine.positions["SOL"] = PaperPosition(
+            symbol="SOL",
+            entry_price=_D100,
+            quantity=_D10,
+            entry_time=datetime.now(),
+            stop_loss=_D95
+        )
+        
+        assert dict(engine.positions) == {"SOL": engine.positions["SOL"]}
+        closed_trades = engine.update_positions({"SOL": Decimal("94")})
+        
+        assert [t.exit_reason for t in closed_trades] == ["stop_loss"]
+        assert "SOL" not in engine.positions
+    
     def test_performance_metrics_no_trades(self, engine):
         """Test metrics with no trades."""
         metrics = engine.get_performance_metrics()
@@ -251,12 +360,12 @@ class TestPaperTradingEngine:
         """Test metrics with completed trades."""
         # Execute some trades
         # Trade 1: Winner
-        engine.execute_buy("SOL", Decimal("10"), Decimal("100"))
-        engine.execute_sell("SOL", Decimal("110"))
+        engine.execute_buy("SOL", _D10, _D100)
+        engine.execute_sell("SOL", _D110)
         
         # Trade 2: Loser
-        engine.execute_buy("ETH", Decimal("5"), Decimal("200"))
-        engine.execute_sell("ETH", Decimal("190"))
+        engine.execute_buy("ETH", _D5, _D200)
+        engine.execute_sell("ETH", _D190)
         
         metrics = engine.get_performance_metrics()
         
@@ -268,14 +377,46 @@ class TestPaperTradingEngine:
         assert metrics["avg_loss"] > 0
         assert metrics["profit_factor"] > 0
     
+    def test_performance_metrics_keep_their_own_trade_count(self, engine):
+        """Test trimming the public closed_trades list leaves the metrics intact."""
+        engine.execute_buy("SOL", _D10, _D100)
+        engine.execute_sell("SOL", _D110)
+        engine.execute_buy("ETH", _D5, _D200)
+        engine.execute_sell("ETH", _D190)
+        expected = engine.get_performance_metrics()
+        
+        engine.closed_trades.pop(0)
+        metrics = engine.get_performance_metrics()
+        
+        assert metrics["total_trades"] == 2
+        assert metrics["sharpe_ratio"] == expected["sharpe_ratio"]
+        assert metrics["avg_holding_hours"] == expected["avg_holding_hours"]
+    
+    def test_performance_metrics_match_trade_history(self, engine):
+        """Test running totals agree with the closed trades."""
+        for symbol, exit_price in [("SOL", _D110), ("ETH", _D95), ("ADA", _D105), ("DOT", Decimal("90"))]:
+            engine.execute_buy(symbol, _D10, _D100)
+            engine.execute_sell(symbol, exit_price)
+        
+        trades = engine.closed_trades
+        wins = [t.pnl for t in trades if t.pnl > 0]
+        losses = [-t.pnl for t in trades if t.pnl <= 0]
+        metrics = engine.get_performance_metrics()
+        
+        assert metrics["winning_trades"] == len(wins) == 2
+        assert metrics["avg_win"] == float(sum(wins) / len(wins))
+        assert metrics["avg_loss"] == float(sum(losses) / len(losses))
+        assert metrics["total_pnl"] == float(sum(t.pnl for t in trades))
+        assert metrics["total_fees_paid"] == float(sum(t.fees_paid for t in trades))
+    
     def test_max_drawdown_calculation(self, engine):
         """Test maximum drawdown calculation."""
         # Series of losing trades
-        engine.execute_buy("SOL", Decimal("10"), Decimal("100"))
-        engine.execute_sell("SOL", Decimal("95"))  # -5%
+        engine.execute_buy("SOL", _D10, _D100)
+        engine.execute_sell("SOL", _D95)  # -5%
         
-        engine.execute_buy("ETH", Decimal("5"), Decimal("200"))
-        engine.execute_sell("ETH", Decimal("190"))  # -5%
+        engine.execute_buy("ETH", _D5, _D200)
+        engine.execute_sell("ETH", _D190)  # -5%
         
         metrics = engine.get_performance_metrics()
         assert metrics["max_drawdown_pct"] > 0
@@ -283,8 +424,8 @@ class TestPaperTradingEngine:
     def test_generate_report(self, engine):
         """Test report generation."""
         # Execute a trade
-        engine.execute_buy("SOL", Decimal("10"), Decimal("100"))
-        engine.execute_sell("SOL", Decimal("110"))
+        engine.execute_buy("SOL", _D10, _D100)
+        engine.execute_sell("SOL", _D110)
         
         report = engine.generate_report()
         
@@ -297,10 +438,12 @@ class TestPaperTradingEngine:
     def test_trade_history(self, engine):
         """Test trade history retrieval."""
         # Execute multiple trades
-        for i in range(5):
-            symbol = f"TOKEN{i}"
-            engine.execute_buy(symbol, Decimal("10"), Decimal("100"))
-            engine.execute_sell(symbol, Decimal("105"))
+        symbols = [f"TOKEN{i}" for i in range(5)]
+        engine.execute_buys([(symbol, _D10, _D100) for symbol in symbols])
+        trades = engine.execute_sells([(symbol, _D105) for symbol in symbols])
+        
+        assert all(trade is not None for trade in trades)
+        assert len({trade.exit_time for trade in trades}) == 1
         
         history = engine.get_trade_history(limit=3)
         
@@ -311,15 +454,15 @@ class TestPaperTradingEngine:
     def test_multiple_positions(self, engine):
         """Test managing multiple positions."""
         # Open multiple positions
-        engine.execute_buy("SOL", Decimal("10"), Decimal("100"))
-        engine.execute_buy("ETH", Decimal("5"), Decimal("200"))
-        engine.execute_buy("BTC", Decimal("1"), Decimal("50000"))
+        engine.execute_buy("SOL", _D10, _D100)
+        engine.execute_buy("ETH", _D5, _D200)
+        engine.execute_buy("BTC", _D1, _D50000)
         
         assert len(engine.positions) == 3
         
         # Update with new prices
         market_prices = {
-            "SOL": Decimal("105"),
+            "SOL": _D105,
             "ETH": Decimal("210"),
             "BTC": Decimal("52000")
         }
@@ -330,14 +473,14 @@ class TestPaperTradingEngine:
     def test_slippage_simulation(self, engine):
         """Test that slippage is correctly applied."""
         # Buy with 0.2% slippage
-        engine.execute_buy("SOL", Decimal("10"), Decimal("100"))
+        engine.execute_buy("SOL", _D10, _D100)
         
         position = engine.positions["SOL"]
         # Buy price should be 100 * 1.002 = 100.2
         assert position.entry_price == Decimal("100.2")
         
         # Sell with 0.2% slippage
-        trade = engine.execute_sell("SOL", Decimal("110"))
+        trade = engine.execute_sell("SOL", _D110)
         
         # Sell price should be 110 * 0.998 = 109.78
         assert trade.exit_price == Decimal("109.78")
@@ -347,29 +490,40 @@ class TestPaperTradingEngine:
         initial_cash = engine.cash
         
         # Buy $1000 worth (10 * 100)
-        engine.execute_buy("SOL", Decimal("10"), Decimal("100"))
+        engine.execute_buy("SOL", _D10, _D100)
         
         position = engine.positions["SOL"]
         
         # Fees should be ~1% of cost (0.1% fee rate)
-        expected_fees = Decimal("100.2") * Decimal("10") * Decimal("0.001")
-        assert abs(position.fees_paid - expected_fees) < Decimal("0.01")
+        expected_fees = Decimal("100.2") * _D10 * _FEE_RATE
+        assert position.fees_paid == pytest.approx(expected_fees, abs=_TOLERANCE)
         
         # Total cost should be slippage + fees
         # 100.2 * 10 * 1.001 = 1003.002
         expected_cost = Decimal("1003.002")
         cash_spent = initial_cash - engine.cash
-        assert abs(cash_spent - expected_cost) < Decimal("0.01")
+        assert cash_spent == pytest.approx(expected_cost, abs=_TOLERANCE)
     
     def test_daily_pnl_tracking(self, engine):
         """Test daily P/L tracking."""
         # Execute trade today
-        engine.execute_buy("SOL", Decimal("10"), Decimal("100"))
-        engine.execute_sell("SOL", Decimal("110"))
+        engine.execute_buy("SOL", _D10, _D100)
+        engine.execute_sell("SOL", _D110)
         
         today = datetime.now().date().isoformat()
         assert today in engine.daily_pnl
         assert engine.daily_pnl[today] > 0  # Profit today
+    
+    def test_daily_pnl_keyed_by_exit_date(self, engine):
+        """Test trades on the same day accumulate under their exit date."""
+        engine.execute_buy("SOL", _D10, _D100)
+        first = engine.execute_sell("SOL", _D110)
+        engine.execute_buy("ETH", _D5, _D200)
+        second = engine.execute_sell("ETH", _D190)
+        
+        assert first.exit_time.date() == second.exit_time.date()
+        day = second.exit_time.date().isoformat()
+        assert engine.daily_pnl == {day: first.pnl + second.pnl}
 
 
 class TestPaperTrade:
@@ -382,20 +536,20 @@ class TestPaperTrade:
         
         trade = PaperTrade(
             symbol="SOL",
-            entry_price=Decimal("100"),
-            exit_price=Decimal("110"),
-            quantity=Decimal("10"),
+            entry_price=_D100,
+            exit_price=_D110,
+            quantity=_D10,
             entry_time=entry_time,
             exit_time=exit_time,
-            pnl=Decimal("100"),
-            pnl_pct=Decimal("10"),
+            pnl=_D100,
+            pnl_pct=_D10,
             fees_paid=Decimal("2"),
             exit_reason="take_profit",
             strategy="test",
             confidence=Decimal("0.8")
         )
         
-        assert abs(trade.holding_period_hours - 5.0) < 0.01
+        assert trade.holding_period_hours == pytest.approx(5.0, abs=0.01)
 
 
 class TestEdgeCases:
@@ -407,7 +561,7 @@ class TestEdgeCases:
         success = engine.execute_buy(
             symbol="SOL",
             quantity=Decimal("0"),
-            price=Decimal("100")
+            price=_D100
         )
         assert success is False
     
@@ -416,7 +570,7 @@ class TestEdgeCases:
         engine = PaperTradingEngine()
         success = engine.execute_buy(
             symbol="SOL",
-            quantity=Decimal("10"),
+            quantity=_D10,
             price=Decimal("-100")
         )
         assert success is False
@@ -426,15 +580,15 @@ class TestEdgeCases:
         engine = PaperTradingEngine(initial_capital=Decimal("0"))
         success = engine.execute_buy(
             symbol="SOL",
-            quantity=Decimal("1"),
-            price=Decimal("100")
+            quantity=_D1,
+            price=_D100
         )
         assert success is False
     
     def test_portfolio_value_with_missing_prices(self):
         """Test portfolio value with missing price data."""
         engine = PaperTradingEngine()
-        engine.execute_buy("SOL", Decimal("10"), Decimal("100"))
+        engine.execute_buy("SOL", _D10, _D100)
         
         # Provide empty price dict
         value = engine.portfolio_value({})
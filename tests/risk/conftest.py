@@ -0,0 +1,116 @@
+"""Shared fixtures for risk management tests."""
+
+from decimal import Decimal
+from typing import NamedTuple
+
+import pytest
+
+from src.risk.position_sizing import AssetTier, PositionSizer, PositionSizeParams
+
+
+class _SizerKey(NamedTuple):
+    """Sample PositionSizeParams fields, overridable with _replace."""
+    portfolio_value: Decimal
+    win_rate: Decimal
+    avg_win: Decimal
+    avg_loss: Decimal
+    confidence: Decimal
+    asset_tier: AssetTier
+
+
+def _build_sizer(key: _SizerKey) -> PositionSizer:
+    """Build (and validate) a new sizer from a set of parameters."""
+    return PositionSizer(PositionSizeParams(**key._asdict()))
+
+
+@pytest.fixture(scope="session", params=[float, Decimal], ids=["float", "decimal"])
+def number_type(request):
+    """Numeric type to build inputs with; runs a test on the float and Decimal paths."""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def sample_win_rate_f(sample_win_rate):
+    """Sample win rate as a float, for the Kelly float fast path."""
+    return float(sample_win_rate)
+
+
+@pytest.fixture(scope="session")
+def sample_avg_win_f(sample_avg_win):
+    """Sample average win as a float."""
+    return float(sample_avg_win)
+
+
+@pytest.fixture(scope="session")
+def sample_avg_loss_f(sample_avg_loss):
+    """Sample average loss as a float."""
+    return float(sample_avg_loss)
+
+
+@pytest.fixture(scope="module")
+def tier_bounds(sample_portfolio_value):
+    """Dollar position caps for the sample portfolio, computed once per module."""
+    return {
+        "foundation_max": sample_portfolio_value * Decimal("0.05"),
+        "foundation_hard": sample_portfolio_value * Decimal("0.02"),
+        "opportunity_max": sample_portfolio_value * Decimal("0.01"),
+    }
+
+
+@pytest.fixture(scope="module")
+def foundation_params(
+    sample_portfolio_value,
+    sample_win_rate,
+    sample_avg_win,
+    sample_avg_loss,
+    sample_confidence,
+):
+    """Sample sizing parameters for a foundation tier asset."""
+    return PositionSizeParams(
+        portfolio_value=sample_portfolio_value,
+        win_rate=sample_win_rate,
+        avg_win=sample_avg_win,
+        avg_loss=sample_avg_loss,
+        confidence=sample_confidence,
+        asset_tier=AssetTier.FOUNDATION,
+    )
+
+
+@pytest.fixture(scope="session")
+def sizer_factory(
+    sample_portfolio_value,
+    sample_win_rate,
+    sample_avg_win,
+    sample_avg_loss,
+    sample_confidence,
+):
+    """
+    Return a factory building sizers for the sample parameters.
+    
+    Any field can be overridden by keyword; every call returns a new sizer.
+    """
+    defaults = _SizerKey(
+        portfolio_value=sample_portfolio_value,
+        win_rate=sample_win_rate,
+        avg_win=sample_avg_win,
+        avg_loss=sample_avg_loss,
+        confidence=sample_confidence,
+        asset_tier=AssetTier.FOUNDATION,
+    )
+    
+    def factory(**overrides) -> PositionSizer:
+        return _build_sizer(defaults._replace(**overrides))
+    
+    return factory
+
+
+@pytest.fixture(scope="module")
+def foundation_sizer(sizer_factory):
+    """Position sizer for a foundation tier asset."""
+    return sizer_factory()
+
+
+@pytest.fixture(scope="module")
+def opportunity_sizer(sizer_factory):
+    """Position sizer for an opportunity tier asset."""
+    return sizer_factory(asset_tier=AssetTier.OPPORTUNITY)
@@ -11,14 +11,30 @@ from src.risk.circuit_breaker import (
     BreakerConfig,
 )
 
+# Frequently used values, parsed once per module
+_D10000 = Decimal("10000")
+_D9500 = Decimal("9500")
+_D9400 = Decimal("9400")
+_D9000 = Decimal("9000")
+_D150 = Decimal("150")
+_D3 = Decimal("3")
+_D0 = Decimal("0")
+
+
+@pytest.fixture(scope="class")
+def breaker():
+    """Create a circuit breaker with default config (shared per class, reset per test)."""
+    return CircuitBreaker()
+
 
 class TestCircuitBreaker:
     """Tests for circuit breaker system."""
     
-    @pytest.fixture
-    def breaker(self):
-        """Create a circuit breaker with default config."""
-        return CircuitBreaker()
+    @pytest.fixture(autouse=True)
+    def reset_breaker(self, breaker):
+        """Start every test from a clean breaker without rebuilding it."""
+        breaker.reset()
+        yield
     
     @pytest.fixture
     def custom_breaker(self):
@@ -31,7 +47,7 @@ class TestCircuitBreaker:
             ),
             BreakerType.CONSECUTIVE_LOSSES: BreakerConfig(
                 breaker_type=BreakerType.CONSECUTIVE_LOSSES,
-                threshold=Decimal("3"),  # 3 losses
+                threshold=_D3,  # 3 losses
                 cooling_period_minutes=1,
             ),
         }
@@ -44,9 +60,9 @@ class TestCircuitBreaker:
     
     def test_daily_loss_breaker_trips(self, breaker):
         """Test daily loss breaker trips when threshold exceeded."""
-        start_value = Decimal("10000")
+        start_value = _D10000
         # 6% loss (exceeds 5% threshold)
-        current_value = Decimal("9400")
+        current_value = _D9400
         
         result = breaker.check_daily_loss(current_value, start_value)
         
@@ -56,7 +72,7 @@ class TestCircuitBreaker:
     
     def test_daily_loss_breaker_does_not_trip(self, breaker):
         """Test daily loss breaker doesn't trip below threshold."""
-        start_value = Decimal("10000")
+        start_value = _D10000
         # 4% loss (below 5% threshold)
         current_value = Decimal("9600")
         
@@ -67,7 +83,7 @@ class TestCircuitBreaker:
     
     def test_weekly_loss_breaker(self, breaker):
         """Test weekly loss breaker."""
-        start_value = Decimal("10000")
+        start_value = _D10000
         # 11% loss (exceeds 10% threshold)
         current_value = Decimal("8900")
         
@@ -79,9 +95,9 @@ class TestCircuitBreaker:
     
     def test_weekly_loss_below_threshold(self, breaker):
         """Test weekly loss when below threshold (doesn't trip)."""
-        start_value = Decimal("10000")
+        start_value = _D10000
         # 5% loss (below 10% threshold)
-        current_value = Decimal("9500")
+        current_value = _D9500
         
         result = breaker.check_weekly_loss(current_value, start_value)
         
@@ -91,7 +107,7 @@ class TestCircuitBreaker:
     
     def test_drawdown_breaker(self, breaker):
         """Test drawdown breaker."""
-        peak_value = Decimal("10000")
+        peak_value = _D10000
         # 16% drawdown (exceeds 15% threshold)
         current_value = Decimal("8400")
         
@@ -104,7 +120,7 @@ class TestCircuitBreaker:
     def test_volatility_breaker(self, breaker):
         """Test volatility breaker."""
         # Volatility index of 150 (exceeds 100 threshold)
-        result = breaker.check_volatility(Decimal("150"))
+        result = breaker.check_volatility(_D150)
         
         assert result is True
         assert not breaker.is_trading_allowed()
@@ -119,18 +135,19 @@ class TestCircuitBreaker:
         assert not breaker.is_trading_allowed()
         assert BreakerType.LIQUIDITY in breaker.get_active_breakers()
     
-    def test_consecutive_losses_breaker(self, breaker):
-        """Test consecutive losses breaker."""
-        # Record 4 losses (below threshold)
-        for _ in range(4):
-            result = breaker.record_trade_result(is_win=False)
-            assert result is False  # Should not trip yet
+    @pytest.mark.parametrize("num_losses, should_trip", [
+        (1, False), (2, False), (3, False), (4, False), (5, True),
+    ])
+    def test_consecutive_losses_breaker(self, breaker, num_losses, should_trip):
+        """Test consecutive losses breaker trips on the 5th loss."""
+        for _ in range(num_losses - 1):
+            breaker.record_trade_result(is_win=False)
         
-        # 5th loss should trip
         result = breaker.record_trade_result(is_win=False)
-        assert result is True
-        assert not breaker.is_trading_allowed()
-        assert BreakerType.CONSECUTIVE_LOSSES in breaker.get_active_breakers()
+        
+        assert result is should_trip
+        assert breaker.is_trading_allowed() is not should_trip
+        assert (BreakerType.CONSECUTIVE_LOSSES in breaker.get_active_breakers()) is should_trip
     
     def test_winning_trade_resets_loss_counter(self, breaker):
         """Test that winning trade resets consecutive loss counter."""
@@ -150,18 +167,37 @@ class TestCircuitBreaker:
         result = breaker.record_trade_result(is_win=False)
         assert result is True
     
-    def test_api_failure_breaker(self, breaker):
-        """Test API failure breaker."""
-        # Record 2 failures (below threshold)
-        for _ in range(2):
-            result = breaker.record_api_failure()
-            assert result is False
+    def test_record_trade_results_matches_sequential(self, breaker):
+        """Test bulk recording gives the same state and events as one-by-one calls."""
+        results = [False, False, True, False, False, False, False, False, False, True, False]
+        
+        reference = CircuitBreaker()
+        expected = [reference.record_trade_result(r) for r in results]
+        
+        assert breaker.record_trade_results(results) == expected.index(True)
+        assert breaker.consecutive_losses == reference.consecutive_losses == 1
+        assert [e.actual_value for e in breaker.events] == [e.actual_value for e in reference.events]
+    
+    def test_record_trade_results_continues_run(self, breaker):
+        """Test a losing run carries over between single and bulk calls."""
+        for _ in range(3):
+            breaker.record_trade_result(is_win=False)
+        
+        assert breaker.record_trade_results([False]) is None
+        assert breaker.record_trade_results([False]) == 0
+        assert BreakerType.CONSECUTIVE_LOSSES in breaker.get_active_breakers()
+    
+    @pytest.mark.parametrize("num_failures, should_trip", [(1, False), (2, False), (3, True)])
+    def test_api_failure_breaker(self, breaker, num_failures, should_trip):
+        """Test API failure breaker trips on the 3rd failure."""
+        for _ in range(num_failures - 1):
+            breaker.record_api_failure()
         
-        # 3rd failure should trip
         result = breaker.record_api_failure()
-        assert result is True
-        assert not breaker.is_trading_allowed()
-        assert BreakerType.API_FAILURE in breaker.get_active_breakers()
+        
+        assert result is should_trip
+        assert breaker.is_trading_allowed() is not should_trip
+        assert (BreakerType.API_FAILURE in breaker.get_active_breakers()) is should_trip
     
     def test_api_success_resets_failure_counter(self, breaker):
         """Test that successful API call resets failure counter."""
@@ -183,10 +219,10 @@ class TestCircuitBreaker:
     def test_multiple_breakers_can_trip(self, breaker):
         """Test that multiple breakers can be active simultaneously."""
         # Trip daily loss breaker
-        breaker.check_daily_loss(Decimal("9400"), Decimal("10000"))
+        breaker.check_daily_loss(_D9400, _D10000)
         
         # Trip volatility breaker
-        breaker.check_volatility(Decimal("150"))
+        breaker.check_volatility(_D150)
         
         active = breaker.get_active_breakers()
         assert len(active) == 2
@@ -198,7 +234,7 @@ class TestCircuitBreaker:
         import time
         
         # Trip breaker - 11% loss (exceeds 10% threshold)
-        custom_breaker.check_daily_loss(Decimal("8900"), Decimal("10000"))
+        custom_breaker.check_daily_loss(Decimal("8900"), _D10000)
         assert not custom_breaker.is_trading_allowed()
         
         # Wait for cooling period (1 minute in config, but we can't wait that long)
@@ -213,7 +249,7 @@ class TestCircuitBreaker:
     def test_manual_reset(self, breaker):
         """Test manual reset of breaker."""
         # Trip breaker
-        breaker.check_daily_loss(Decimal("9400"), Decimal("10000"))
+        breaker.check_daily_loss(_D9400, _D10000)
         assert not breaker.is_trading_allowed()
         
         # Manual reset
@@ -226,8 +262,8 @@ class TestCircuitBreaker:
     def test_reset_all(self, breaker):
         """Test reset all breakers."""
         # Trip multiple breakers
-        breaker.check_daily_loss(Decimal("9400"), Decimal("10000"))
-        breaker.check_volatility(Decimal("150"))
+        breaker.check_daily_loss(_D9400, _D10000)
+        breaker.check_volatility(_D150)
         breaker.record_trade_result(is_win=False)  # Start loss counter
         
         assert not breaker.is_trading_allowed()
@@ -241,17 +277,48 @@ class TestCircuitBreaker:
         assert breaker.consecutive_losses == 0
         assert len(breaker.events) == 0
     
+    def test_reset(self, breaker):
+        """Test reset clears breakers, counters and tracked values."""
+        breaker.check_volatility(_D150)
+        breaker.record_api_failure()
+        breaker.peak_value = _D10000
+        
+        breaker.reset()
+        
+        assert breaker.is_trading_allowed()
+        assert breaker.consecutive_api_failures == 0
+        assert breaker.peak_value is None
+        assert len(breaker.events) == 0
+    
     def test_get_recent_events(self, breaker):
         """Test retrieving recent breaker events."""
         # Trip some breakers
-        breaker.check_daily_loss(Decimal("9400"), Decimal("10000"))
-        breaker.check_volatility(Decimal("150"))
+        breaker.check_daily_loss(_D9400, _D10000)
+        breaker.check_volatility(_D150)
         
         events = breaker.get_recent_events(minutes=60)
         
         assert len(events) == 2
         assert all(e.timestamp >= datetime.now() - timedelta(minutes=60) for e in events)
     
+    def test_get_recent_events_excludes_old(self, breaker):
+        """Test that events before the window are left out, newest last."""
+        breaker.check_daily_loss(_D9400, _D10000)
+        breaker.events[0].timestamp = datetime.now() - timedelta(minutes=120)
+        breaker.check_volatility(_D150)
+        breaker.check_liquidity(Decimal("30000"))
+        
+        events = breaker.get_recent_events(minutes=60)
+        
+        assert [e.breaker_type for e in events] == [BreakerType.VOLATILITY, BreakerType.LIQUIDITY]
+    
+    def test_events_are_bounded(self, breaker):
+        """Test that the event log keeps only the newest MAX_EVENTS entries."""
+        for _ in range(CircuitBreaker.MAX_EVENTS + 10):
+            breaker.check_volatility(_D150)
+        
+        assert len(breaker.events) == CircuitBreaker.MAX_EVENTS
+    
     def test_disabled_breaker_does_not_trip(self):
         """Test that disabled breakers don't trip."""
         configs = {
@@ -264,7 +331,7 @@ class TestCircuitBreaker:
         breaker = CircuitBreaker(configs)
         
         # Try to trip disabled breaker
-        result = breaker.check_daily_loss(Decimal("9400"), Decimal("10000"))
+        result = breaker.check_daily_loss(_D9400, _D10000)
         
         # Should not trip
         assert result is False
@@ -272,8 +339,8 @@ class TestCircuitBreaker:
     
     def test_breaker_event_details(self, breaker):
         """Test that breaker events contain correct details."""
-        start_value = Decimal("10000")
-        current_value = Decimal("9400")
+        start_value = _D10000
+        current_value = _D9400
         
         breaker.check_daily_loss(current_value, start_value)
         
@@ -289,20 +356,21 @@ class TestCircuitBreaker:
     def test_zero_values_dont_crash(self, breaker):
         """Test that zero/invalid values don't crash the system."""
         # Zero start value should not crash
-        result = breaker.check_daily_loss(Decimal("9000"), Decimal("0"))
+        result = breaker.check_daily_loss(_D9000, _D0)
         assert result is False
         
-        result = breaker.check_weekly_loss(Decimal("9000"), Decimal("0"))
+        result = breaker.check_weekly_loss(_D9000, _D0)
         assert result is False
         
-        result = breaker.check_drawdown(Decimal("9000"), Decimal("0"))
+        result = breaker.check_drawdown(_D9000, _D0)
         assert result is False
+        assert len(breaker.get_active_breakers()) == 0
     
     def test_edge_case_exact_threshold(self, breaker):
         """Test behavior at exact threshold value."""
-        start_value = Decimal("10000")
+        start_value = _D10000
         # Exactly 5% loss (at threshold)
-        current_value = Decimal("9500")
+        current_value = _D9500
         
         # Should NOT trip (must exceed threshold)
         result = breaker.check_daily_loss(current_value, start_value)
@@ -329,7 +397,7 @@ class TestCircuitBreakerEdgeCases:
         breaker = CircuitBreaker(configs)
         
         # Should not trip even with large loss
-        result = breaker.check_weekly_loss(Decimal("5000"), Decimal("10000"))
+        result = breaker.check_weekly_loss(Decimal("5000"), _D10000)
         assert result is False
     
     def test_drawdown_disabled(self):
@@ -344,7 +412,7 @@ class TestCircuitBreakerEdgeCases:
         breaker = CircuitBreaker(configs)
         
         # Should not trip even with large drawdown
-        result = breaker.check_drawdown(Decimal("5000"), Decimal("10000"))
+        result = breaker.check_drawdown(Decimal("5000"), _D10000)
         assert result is False
     
     def test_volatility_disabled(self):
@@ -372,7 +440,7 @@ class TestCircuitBreakerEdgeCases:
         }
         breaker = CircuitBreaker(configs)
         
-        result = breaker.check_liquidity(Decimal("10000"))
+        result = breaker.check_liquidity(_D10000)
         assert result is False
     
     def test_consecutive_losses_disabled(self):
@@ -380,7 +448,7 @@ class TestCircuitBreakerEdgeCases:
         configs = {
             BreakerType.CONSECUTIVE_LOSSES: BreakerConfig(
                 breaker_type=BreakerType.CONSECUTIVE_LOSSES,
-                threshold=Decimal("3"),
+                threshold=_D3,
                 enabled=False,
             ),
         }
@@ -396,7 +464,7 @@ class TestCircuitBreakerEdgeCases:
         configs = {
             BreakerType.API_FAILURE: BreakerConfig(
                 breaker_type=BreakerType.API_FAILURE,
-                threshold=Decimal("3"),
+                threshold=_D3,
                 enabled=False,
             ),
         }
@@ -412,7 +480,7 @@ class TestCircuitBreakerEdgeCases:
         breaker = CircuitBreaker()
         
         # Small drawdown (5%) - should not trip (threshold is 15%)
-        result = breaker.check_drawdown(Decimal("9500"), Decimal("10000"))
+        result = breaker.check_drawdown(_D9500, _D10000)
         assert result is False  # Cover line 190
         assert breaker.is_trading_allowed()
     
@@ -449,31 +517,17 @@ class TestBreakerIntegration:
     def test_trading_flow_with_breakers(self):
         """Test typical trading flow with circuit breakers."""
         breaker = CircuitBreaker()
-        portfolio_value = Decimal("10000")
+        portfolio_value = _D10000
         
         # Start of day
         assert breaker.is_trading_allowed()
         
-        # Make some trades
-        breaker.record_trade_result(is_win=True)
-        breaker.record_trade_result(is_win=True)
-        
-        # Still allowed
-        assert breaker.is_trading_allowed()
-        
-        # Market turns bad
-        breaker.record_trade_result(is_win=False)
-        breaker.record_trade_result(is_win=False)
-        breaker.record_trade_result(is_win=False)
-        
-        # Still allowed (only 3 losses)
-        assert breaker.is_trading_allowed()
-        
-        # More losses
-        breaker.record_trade_result(is_win=False)
-        breaker.record_trade_result(is_win=False)
+        # Two wins, then the market turns bad: the 5th straight loss trips
+        trip_index = breaker.record_trade_results(
+            [True, True, False, False, False, False, False]
+        )
         
-        # Should trip now (5 consecutive losses)
+        assert trip_index == 6
         assert not breaker.is_trading_allowed()
     
     def test_multiple_safety_nets(self):
@@ -481,7 +535,7 @@ class TestBreakerIntegration:
         breaker = CircuitBreaker()
         
         # High volatility
-        breaker.check_volatility(Decimal("150"))
+        breaker.check_volatility(_D150)
         
         # AND low liquidity
         breaker.check_liquidity(Decimal("30000"))
@@ -500,7 +554,7 @@ class TestBreakerIntegration:
         configs = {
             BreakerType.CONSECUTIVE_LOSSES: BreakerConfig(
                 breaker_type=BreakerType.CONSECUTIVE_LOSSES,
-                threshold=Decimal("3"),
+                threshold=_D3,
                 cooling_period_minutes=1,
             ),
         }
@@ -1,8 +1,10 @@
 """Tests for position sizing module."""
 
+import math
 import pytest
-from decimal import Decimal
-from hypothesis import given, strategies as st
+from dataclasses import replace
+from decimal import Decimal, localcontext
+from hypothesis import HealthCheck, given, settings, strategies as st
 
 from src.risk.position_sizing import (
     KellyCriterion,
@@ -13,187 +15,226 @@ from src.risk.position_sizing import (
     min_win_rate_for_profitability,
 )
 
+_TOLERANCE = 0.01  # Dollar/price tolerance, compared as floats
+
+# Loop-invariant values shared by the sizing and property tests
+_STOP_LOSS_PCT = Decimal("5.0")
+_STOP_LOSS_FACTOR = Decimal("0.95")  # 1 - _STOP_LOSS_PCT / 100
+_WIN_RATE_70 = Decimal("0.7")
+_CONF_90 = Decimal("0.9")
+_D100 = Decimal("100")
+_D50 = Decimal("50")
+_ONE = Decimal("1")
+_HALF = Decimal("0.5")
+_QUARTER = Decimal("0.25")
+_RR_1 = Decimal("1.0")
+_RR_2 = Decimal("2.0")
+_RR_3 = Decimal("3.0")
+_RR_4 = Decimal("4.0")
+
+# Bound once so the property tests skip the class attribute lookup per example
+_kelly = KellyCriterion.calculate
+
+# Broad coverage lives in test_position_sizing_vectorized.py; the property
+# tests stay small and deterministic so slow examples don't trigger shrinking.
+# Float properties are cheap enough for more examples than the Decimal ones.
+_PROPERTY_SETTINGS = settings(max_examples=50, deadline=None, derandomize=True)
+_DECIMAL_PROPERTY_SETTINGS = settings(
+    _PROPERTY_SETTINGS,
+    max_examples=10,
+    suppress_health_check=[HealthCheck.too_slow],
+)
+
+# Pre-built Decimal pools sampled by the Decimal property test, spanning the
+# same ranges the st.decimals strategies used to draw from
+_PORTFOLIOS = tuple(
+    Decimal(value) for value in (
+        "1000", "1000.01", "2500.50", "10000", "33333.33",
+        "100000", "250000.75", "999999.99", "1000000",
+    )
+)
+_ENTRY_PRICES = tuple(
+    Decimal(value) for value in (
+        "0.01", "0.37", "1", "9.99", "100", "1234.56", "9999.99", "10000",
+    )
+)
+
+# Strategies built once and shared by the @given decorators below
+_WIN_RATE_STRAT = st.floats(min_value=0.51, max_value=0.99, allow_nan=False)
+_AMOUNT_STRAT = st.floats(min_value=1, max_value=1000, allow_nan=False)
+_WIN_RATE_DEC_STRAT = st.decimals(min_value=Decimal("0.51"), max_value=Decimal("0.99"), places=2)
+_AMOUNT_DEC_STRAT = st.decimals(min_value=1, max_value=1000, places=2)
+_PORTFOLIO_STRAT = st.sampled_from(_PORTFOLIOS)
+_ENTRY_STRAT = st.sampled_from(_ENTRY_PRICES)
+_REWARD_PCT_STRAT = st.floats(min_value=5, max_value=100, allow_nan=False)
+_RISK_PCT_STRAT = st.floats(min_value=1, max_value=20, allow_nan=False)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _reduce_decimal_prec():
+    """Run this module at 12 significant digits; sizing math needs ~10, not 28."""
+    with localcontext() as ctx:
+        ctx.prec = 12
+        yield
+
+
+def _rr_from_pct(reward_pct, risk_pct):
+    """Risk-reward for targets set as % moves from entry; the entry price cancels."""
+    return reward_pct / risk_pct
+
 
 class TestKellyCriterion:
     """Tests for Kelly Criterion calculator."""
     
-    def test_kelly_with_positive_edge(self):
+    def test_kelly_with_positive_edge(self, sample_win_rate_f, sample_avg_win_f, sample_avg_loss_f):
         """Test Kelly with positive edge (should recommend position)."""
-        win_rate = Decimal("0.60")  # 60% win rate
-        avg_win = Decimal("100")
-        avg_loss = Decimal("50")
-        
-        kelly = KellyCriterion.calculate(win_rate, avg_win, avg_loss)
+        # 60% win rate, 2:1 win/loss ratio
+        kelly = KellyCriterion.calculate(sample_win_rate_f, sample_avg_win_f, sample_avg_loss_f)
         
         # Should recommend some position
         assert kelly > 0
         # Should be conservative (fractional Kelly)
-        assert kelly <= Decimal("0.1")  # Less than or equal to 10%
+        assert kelly <= 0.1  # Less than or equal to 10%
     
-    def test_kelly_with_negative_edge(self):
+    def test_kelly_with_negative_edge(self, number_type):
         """Test Kelly with negative edge (should not recommend position)."""
-        win_rate = Decimal("0.40")  # 40% win rate (losing edge)
-        avg_win = Decimal("50")
-        avg_loss = Decimal("100")
+        win_rate = number_type("0.40")  # 40% win rate (losing edge)
+        avg_win = number_type("50")
+        avg_loss = number_type("100")
         
         kelly = KellyCriterion.calculate(win_rate, avg_win, avg_loss)
         
         # Should recommend no position
         assert kelly == 0
     
-    def test_kelly_minimum_win_rate(self):
+    def test_kelly_minimum_win_rate(self, number_type):
         """Test that Kelly returns 0 below minimum win rate."""
-        win_rate = Decimal("0.50")  # Exactly break-even
-        avg_win = Decimal("100")
-        avg_loss = Decimal("100")
+        win_rate = number_type("0.50")  # Exactly break-even
+        avg_win = number_type("100")
+        avg_loss = number_type("100")
         
         kelly = KellyCriterion.calculate(win_rate, avg_win, avg_loss)
         
         assert kelly == 0
     
-    def test_kelly_zero_avg_loss(self):
+    def test_kelly_zero_avg_loss(self, number_type):
         """Test Kelly with zero average loss (edge case)."""
-        win_rate = Decimal("0.60")
-        avg_win = Decimal("100")
-        avg_loss = Decimal("0")
+        win_rate = number_type("0.60")
+        avg_win = number_type("100")
+        avg_loss = number_type("0")
         
         kelly = KellyCriterion.calculate(win_rate, avg_win, avg_loss)
         
         assert kelly == 0
     
-    def test_kelly_zero_avg_win(self):
+    def test_kelly_zero_avg_win(self, number_type):
         """Test Kelly criterion with zero average win."""
-        win_rate = Decimal("0.60")
-        avg_win = Decimal("0")
-        avg_loss = Decimal("100")
+        win_rate = number_type("0.60")
+        avg_win = number_type("0")
+        avg_loss = number_type("100")
         
         kelly = KellyCriterion.calculate(win_rate, avg_win, avg_loss)
         
         assert kelly == 0  # Can't calculate with zero avg_win
     
-    def test_kelly_negative_avg_win(self):
+    def test_kelly_negative_avg_win(self, number_type):
         """Test Kelly criterion with negative average win."""
-        win_rate = Decimal("0.60")
-        avg_win = Decimal("-50")
-        avg_loss = Decimal("100")
+        win_rate = number_type("0.60")
+        avg_win = number_type("-50")
+        avg_loss = number_type("100")
         
         kelly = KellyCriterion.calculate(win_rate, avg_win, avg_loss)
         
         assert kelly == 0  # Invalid scenario
     
-    def test_kelly_custom_fraction(self):
+    def test_kelly_custom_fraction(self, number_type):
         """Test Kelly with custom fractional value."""
-        win_rate = Decimal("0.60")
-        avg_win = Decimal("100")
-        avg_loss = Decimal("50")
+        win_rate = number_type("0.60")
+        avg_win = number_type("100")
+        avg_loss = number_type("50")
         
-        kelly_25 = KellyCriterion.calculate(win_rate, avg_win, avg_loss, Decimal("0.25"))
-        kelly_50 = KellyCriterion.calculate(win_rate, avg_win, avg_loss, Decimal("0.50"))
+        kelly_25 = KellyCriterion.calculate(win_rate, avg_win, avg_loss, number_type("0.25"))
+        kelly_50 = KellyCriterion.calculate(win_rate, avg_win, avg_loss, number_type("0.50"))
         
-        # 50% Kelly should be exactly double 25% Kelly
-        assert kelly_50 == kelly_25 * 2
+        # 50% Kelly should be double 25% Kelly, in the input's numeric type
+        assert isinstance(kelly_25, number_type)
+        assert math.isclose(kelly_50, kelly_25 * 2, rel_tol=1e-9)
+    
+    def test_kelly_float_matches_decimal(self):
+        """Test the float fast path agrees with the Decimal calculation."""
+        cases = [
+            ("0.60", "100", "50"),
+            ("0.51", "10", "90"),
+            ("0.75", "250.5", "80.25"),
+            ("0.50", "100", "100"),
+            ("0.90", "1000", "1"),
+        ]
+        for win_rate, avg_win, avg_loss in cases:
+            expected = KellyCriterion.calculate(
+                Decimal(win_rate), Decimal(avg_win), Decimal(avg_loss)
+            )
+            kelly = KellyCriterion.calculate(
+                float(win_rate), float(avg_win), float(avg_loss)
+            )
+            
+            assert isinstance(kelly, float)
+            assert math.isclose(kelly, float(expected), abs_tol=1e-9)
     
+    @pytest.mark.slow
+    @_PROPERTY_SETTINGS
     @given(
-        win_rate=st.decimals(min_value=0.51, max_value=0.99, places=2),
-        avg_win=st.decimals(min_value=1, max_value=1000, places=2),
-        avg_loss=st.decimals(min_value=1, max_value=1000, places=2),
+        win_rate=_WIN_RATE_STRAT,
+        avg_win=_AMOUNT_STRAT,
+        avg_loss=_AMOUNT_STRAT,
     )
     def test_kelly_never_exceeds_100_percent(self, win_rate, avg_win, avg_loss):
         """Property test: Kelly should never recommend >100% position."""
-        kelly = KellyCriterion.calculate(win_rate, avg_win, avg_loss)
+        kelly = _kelly(win_rate, avg_win, avg_loss)
+        assert 0 <= kelly <= 1
+    
+    @pytest.mark.slow
+    @_DECIMAL_PROPERTY_SETTINGS
+    @given(
+        win_rate=_WIN_RATE_DEC_STRAT,
+        avg_win=_AMOUNT_DEC_STRAT,
+        avg_loss=_AMOUNT_DEC_STRAT,
+    )
+    def test_kelly_decimal_never_exceeds_100_percent(self, win_rate, avg_win, avg_loss):
+        """Property test: Kelly on the Decimal path stays within [0, 1]."""
+        kelly = _kelly(win_rate, avg_win, avg_loss)
+        assert isinstance(kelly, Decimal)
         assert 0 <= kelly <= 1
 
 
 class TestPositionSizer:
     """Tests for position sizing calculator."""
     
-    def test_foundation_position_sizing(
-        self,
-        sample_portfolio_value,
-        sample_win_rate,
-        sample_avg_win,
-        sample_avg_loss,
-        sample_confidence,
-    ):
+    def test_foundation_position_sizing(self, foundation_sizer, tier_bounds):
         """Test position sizing for foundation tier (BTC/ETH/SOL)."""
-        params = PositionSizeParams(
-            portfolio_value=sample_portfolio_value,
-            win_rate=sample_win_rate,
-            avg_win=sample_avg_win,
-            avg_loss=sample_avg_loss,
-            confidence=sample_confidence,
-            asset_tier=AssetTier.FOUNDATION,
-        )
-        
-        sizer = PositionSizer(params)
-        position_size = sizer.calculate_position_size()
+        position_size = foundation_sizer.calculate_position_size()
         
         # Should return a positive position
         assert position_size > 0
         
         # Should not exceed tier limit (5% for foundation)
-        max_allowed = sample_portfolio_value * Decimal("0.05")
-        assert position_size <= max_allowed
+        assert position_size <= tier_bounds["foundation_max"]
         
         # Should not exceed hard maximum (2%)
-        hard_max = sample_portfolio_value * Decimal("0.02")
-        assert position_size <= hard_max
-    
-    def test_opportunity_position_sizing(
-        self,
-        sample_portfolio_value,
-        sample_win_rate,
-        sample_avg_win,
-        sample_avg_loss,
-        sample_confidence,
-    ):
+        assert position_size <= tier_bounds["foundation_hard"]
+    
+    def test_opportunity_position_sizing(self, opportunity_sizer, tier_bounds):
         """Test position sizing for opportunity tier (memecoins)."""
-        params = PositionSizeParams(
-            portfolio_value=sample_portfolio_value,
-            win_rate=sample_win_rate,
-            avg_win=sample_avg_win,
-            avg_loss=sample_avg_loss,
-            confidence=sample_confidence,
-            asset_tier=AssetTier.OPPORTUNITY,
-        )
-        
-        sizer = PositionSizer(params)
-        position_size = sizer.calculate_position_size()
+        position_size = opportunity_sizer.calculate_position_size()
         
         # Should be much smaller than foundation
-        max_allowed = sample_portfolio_value * Decimal("0.01")  # 1% max for memecoins
-        assert position_size <= max_allowed
+        assert position_size <= tier_bounds["opportunity_max"]  # 1% max for memecoins
     
     def test_confidence_affects_position_size(
-        self,
-        sample_portfolio_value,
-        sample_win_rate,
-        sample_avg_win,
-        sample_avg_loss,
-        high_confidence,
-        low_confidence,
+        self, sizer_factory, high_confidence, low_confidence
     ):
         """Test that higher confidence results in larger positions."""
-        params_high = PositionSizeParams(
-            portfolio_value=sample_portfolio_value,
-            win_rate=sample_win_rate,
-            avg_win=sample_avg_win,
-            avg_loss=sample_avg_loss,
-            confidence=high_confidence,
-            asset_tier=AssetTier.FOUNDATION,
-        )
-        
-        params_low = PositionSizeParams(
-            portfolio_value=sample_portfolio_value,
-            win_rate=sample_win_rate,
-            avg_win=sample_avg_win,
-            avg_loss=sample_avg_loss,
-            confidence=low_confidence,
-            asset_tier=AssetTier.FOUNDATION,
-        )
-        
-        sizer_high = PositionSizer(params_high)
-        sizer_low = PositionSizer(params_low)
+        sizer_high = sizer_factory(confidence=high_confidence)
+        sizer_low = sizer_high.with_confidence(low_confidence)
         
         high_pos = sizer_high.calculate_position_size()
         low_pos = sizer_low.calculate_position_size()
@@ -201,294 +242,125 @@ class TestPositionSizer:
         # Higher confidence should result in larger position
         assert high_pos > low_pos
     
-    def test_invalid_parameters_raise_errors(self):
-        """Test that invalid parameters raise appropriate errors."""
-        # Negative portfolio value
-        with pytest.raises(ValueError, match="Portfolio value must be positive"):
-            params = PositionSizeParams(
-                portfolio_value=Decimal("-1000"),
-                win_rate=Decimal("0.6"),
-                avg_win=Decimal("100"),
-                avg_loss=Decimal("50"),
-                confidence=Decimal("0.8"),
-                asset_tier=AssetTier.FOUNDATION,
-            )
-            PositionSizer(params)
+    def test_with_confidence(self, foundation_sizer, low_confidence):
+        """Test with_confidence copies the sizer and validates the new score."""
+        sizer = foundation_sizer.with_confidence(low_confidence)
         
-        # Invalid win rate
-        with pytest.raises(ValueError, match="Win rate must be between 0 and 1"):
-            params = PositionSizeParams(
-                portfolio_value=Decimal("10000"),
-                win_rate=Decimal("1.5"),  # >100%
-                avg_win=Decimal("100"),
-                avg_loss=Decimal("50"),
-                confidence=Decimal("0.8"),
-                asset_tier=AssetTier.FOUNDATION,
-            )
-            PositionSizer(params)
+        assert sizer.params.confidence == low_confidence
+        assert sizer.params.asset_tier == foundation_sizer.params.asset_tier
+        assert foundation_sizer.params.confidence != low_confidence
         
-        # Invalid confidence
         with pytest.raises(ValueError, match="Confidence must be between 0 and 1"):
-            params = PositionSizeParams(
-                portfolio_value=Decimal("10000"),
-                win_rate=Decimal("0.6"),
-                avg_win=Decimal("100"),
-                avg_loss=Decimal("50"),
-                confidence=Decimal("1.5"),  # >100%
-                asset_tier=AssetTier.FOUNDATION,
-            )
-            PositionSizer(params)
-        
-        # Invalid avg_win (zero)
-        with pytest.raises(ValueError, match="Average win must be positive"):
-            params = PositionSizeParams(
-                portfolio_value=Decimal("10000"),
-                win_rate=Decimal("0.6"),
-                avg_win=Decimal("0"),
-                avg_loss=Decimal("50"),
-                confidence=Decimal("0.8"),
-                asset_tier=AssetTier.FOUNDATION,
-            )
-            PositionSizer(params)
+            foundation_sizer.with_confidence(Decimal("1.5"))
+    
+    @pytest.mark.parametrize("field,bad_value,msg", [
+        ("portfolio_value", Decimal("-1000"), "Portfolio value must be positive"),
+        ("win_rate", Decimal("1.5"), "Win rate must be between 0 and 1"),
+        ("confidence", Decimal("1.5"), "Confidence must be between 0 and 1"),
+        ("avg_win", Decimal("0"), "Average win must be positive"),
+        ("avg_loss", Decimal("-50"), "Average loss must be positive"),
+    ])
+    def test_invalid_parameters_raise_errors(self, foundation_params, field, bad_value, msg):
+        """Test that invalid parameters raise appropriate errors."""
+        params = replace(foundation_params, **{field: bad_value})
         
-        # Invalid avg_loss (negative)
-        with pytest.raises(ValueError, match="Average loss must be positive"):
-            params = PositionSizeParams(
-                portfolio_value=Decimal("10000"),
-                win_rate=Decimal("0.6"),
-                avg_win=Decimal("100"),
-                avg_loss=Decimal("-50"),
-                confidence=Decimal("0.8"),
-                asset_tier=AssetTier.FOUNDATION,
-            )
+        with pytest.raises(ValueError, match=msg):
             PositionSizer(params)
     
-    def test_stop_loss_calculation(
-        self,
-        sample_portfolio_value,
-        sample_win_rate,
-        sample_avg_win,
-        sample_avg_loss,
-        sample_confidence,
-        sample_entry_price,
-    ):
+    def test_stop_loss_calculation(self, foundation_sizer, sample_entry_price):
         """Test stop loss price calculation."""
-        params = PositionSizeParams(
-            portfolio_value=sample_portfolio_value,
-            win_rate=sample_win_rate,
-            avg_win=sample_avg_win,
-            avg_loss=sample_avg_loss,
-            confidence=sample_confidence,
-            asset_tier=AssetTier.FOUNDATION,
-        )
-        
-        sizer = PositionSizer(params)
-        stop_loss = sizer.calculate_stop_loss(sample_entry_price, Decimal("5.0"))
+        stop_loss = foundation_sizer.calculate_stop_loss(sample_entry_price, _STOP_LOSS_PCT)
         
         # Stop loss should be below entry
         assert stop_loss < sample_entry_price
         
         # Should be approximately 5% below entry
-        expected = sample_entry_price * Decimal("0.95")
-        assert abs(stop_loss - expected) < Decimal("0.01")
+        expected = sample_entry_price * _STOP_LOSS_FACTOR
+        assert math.isclose(float(stop_loss), float(expected), abs_tol=_TOLERANCE)
     
-    def test_stop_loss_with_zero_risk(self):
-        """Test stop loss calculation with zero risk percentage."""
-        params = PositionSizeParams(
-            portfolio_value=Decimal("10000"),
-            win_rate=Decimal("0.6"),
-            avg_win=Decimal("100"),
-            avg_loss=Decimal("50"),
-            confidence=Decimal("0.8"),
-            asset_tier=AssetTier.FOUNDATION,
-        )
-        
-        sizer = PositionSizer(params)
-        entry_price = Decimal("100")
-        
-        # Zero or negative risk should raise error
+    @pytest.mark.parametrize("stop_loss_pct", [Decimal("0"), Decimal("-5")], ids=["zero", "negative"])
+    def test_stop_loss_with_zero_risk(self, foundation_sizer, stop_loss_pct):
+        """Test stop loss calculation with zero or negative risk percentage."""
         with pytest.raises(ValueError, match="Stop loss percentage must be positive"):
-            sizer.calculate_stop_loss(entry_price, Decimal("0"))
-        
-        with pytest.raises(ValueError, match="Stop loss percentage must be positive"):
-            sizer.calculate_stop_loss(entry_price, Decimal("-5"))
+            foundation_sizer.calculate_stop_loss(_D100, stop_loss_pct)
     
-    def test_stop_loss_with_large_risk(self):
+    def test_stop_loss_with_large_risk(self, foundation_sizer):
         """Test stop loss calculation with large risk percentage."""
-        params = PositionSizeParams(
-            portfolio_value=Decimal("10000"),
-            win_rate=Decimal("0.6"),
-            avg_win=Decimal("100"),
-            avg_loss=Decimal("50"),
-            confidence=Decimal("0.8"),
-            asset_tier=AssetTier.FOUNDATION,
-        )
-        
-        sizer = PositionSizer(params)
-        entry_price = Decimal("100")
+        entry_price = _D100
         
         # 50% risk
-        stop_loss = sizer.calculate_stop_loss(entry_price, Decimal("50"))
-        expected = entry_price * Decimal("0.5")
+        stop_loss = foundation_sizer.calculate_stop_loss(entry_price, _D50)
+        expected = entry_price * _HALF
         assert stop_loss == expected
     
-    def test_stop_loss_invalid_entry_price(self):
+    @pytest.mark.parametrize("entry_price", [Decimal("0"), Decimal("-100")], ids=["zero", "negative"])
+    def test_stop_loss_invalid_entry_price(self, foundation_sizer, entry_price):
         """Test stop loss with invalid entry price."""
-        params = PositionSizeParams(
-            portfolio_value=Decimal("10000"),
-            win_rate=Decimal("0.6"),
-            avg_win=Decimal("100"),
-            avg_loss=Decimal("50"),
-            confidence=Decimal("0.8"),
-            asset_tier=AssetTier.FOUNDATION,
-        )
-        
-        sizer = PositionSizer(params)
-        
-        # Zero entry price - covers line 184
-        with pytest.raises(ValueError, match="Entry price must be positive"):
-            sizer.calculate_stop_loss(Decimal("0"), Decimal("5"))
-        
-        # Negative entry price
         with pytest.raises(ValueError, match="Entry price must be positive"):
-            sizer.calculate_stop_loss(Decimal("-100"), Decimal("5"))
+            foundation_sizer.calculate_stop_loss(entry_price, _STOP_LOSS_PCT)
     
     def test_memecoin_tighter_stop_loss(
-        self,
-        sample_portfolio_value,
-        sample_win_rate,
-        sample_avg_win,
-        sample_avg_loss,
-        sample_confidence,
-        sample_entry_price,
+        self, foundation_sizer, opportunity_sizer, sample_entry_price
     ):
         """Test that memecoins get tighter stop losses."""
-        params_foundation = PositionSizeParams(
-            portfolio_value=sample_portfolio_value,
-            win_rate=sample_win_rate,
-            avg_win=sample_avg_win,
-            avg_loss=sample_avg_loss,
-            confidence=sample_confidence,
-            asset_tier=AssetTier.FOUNDATION,
-        )
-        
-        params_memecoin = PositionSizeParams(
-            portfolio_value=sample_portfolio_value,
-            win_rate=sample_win_rate,
-            avg_win=sample_avg_win,
-            avg_loss=sample_avg_loss,
-            confidence=sample_confidence,
-            asset_tier=AssetTier.OPPORTUNITY,
-        )
-        
-        sizer_foundation = PositionSizer(params_foundation)
-        sizer_memecoin = PositionSizer(params_memecoin)
-        
-        stop_foundation = sizer_foundation.calculate_stop_loss(sample_entry_price, Decimal("5.0"))
-        stop_memecoin = sizer_memecoin.calculate_stop_loss(sample_entry_price, Decimal("5.0"))
+        stop_foundation = foundation_sizer.calculate_stop_loss(sample_entry_price, _STOP_LOSS_PCT)
+        stop_memecoin = opportunity_sizer.calculate_stop_loss(sample_entry_price, _STOP_LOSS_PCT)
         
         # Memecoin stop should be tighter (higher price)
         assert stop_memecoin > stop_foundation
     
-    def test_position_quantity_calculation(
-        self,
-        sample_portfolio_value,
-        sample_win_rate,
-        sample_avg_win,
-        sample_avg_loss,
-        sample_confidence,
-        sample_entry_price,
-    ):
+    def test_position_quantity_calculation(self, foundation_sizer, sample_entry_price):
         """Test token quantity calculation."""
-        params = PositionSizeParams(
-            portfolio_value=sample_portfolio_value,
-            win_rate=sample_win_rate,
-            avg_win=sample_avg_win,
-            avg_loss=sample_avg_loss,
-            confidence=sample_confidence,
-            asset_tier=AssetTier.FOUNDATION,
-        )
-        
-        sizer = PositionSizer(params)
-        quantity = sizer.calculate_position_quantity(sample_entry_price)
+        quantity = foundation_sizer.calculate_position_quantity(sample_entry_price)
         
         # Quantity should be positive
         assert quantity > 0
         
         # Quantity * price should equal position size
-        position_size = sizer.calculate_position_size()
+        position_size = foundation_sizer.calculate_position_size()
         calculated_value = quantity * sample_entry_price
         
         # Allow small rounding error
-        assert abs(calculated_value - position_size) < Decimal("0.01")
+        assert math.isclose(float(calculated_value), float(position_size), abs_tol=_TOLERANCE)
     
-    def test_position_quantity_invalid_entry_price(self):
+    @pytest.mark.parametrize("entry_price", [Decimal("0"), Decimal("-100")], ids=["zero", "negative"])
+    def test_position_quantity_invalid_entry_price(self, foundation_sizer, entry_price):
         """Test position quantity with invalid entry price."""
-        params = PositionSizeParams(
-            portfolio_value=Decimal("10000"),
-            win_rate=Decimal("0.6"),
-            avg_win=Decimal("100"),
-            avg_loss=Decimal("50"),
-            confidence=Decimal("0.8"),
-            asset_tier=AssetTier.FOUNDATION,
-        )
-        
-        sizer = PositionSizer(params)
-        
-        # Zero entry price
-        with pytest.raises(ValueError, match="Entry price must be positive"):
-            sizer.calculate_position_quantity(Decimal("0"))
-        
-        # Negative entry price
         with pytest.raises(ValueError, match="Entry price must be positive"):
-            sizer.calculate_position_quantity(Decimal("-100"))
-    
-    def test_tier_allocation_validation(
-        self,
-        sample_portfolio_value,
-        sample_win_rate,
-        sample_avg_win,
-        sample_avg_loss,
-        sample_confidence,
-    ):
-        """Test tier allocation limit validation."""
-        params = PositionSizeParams(
-            portfolio_value=sample_portfolio_value,
-            win_rate=sample_win_rate,
-            avg_win=sample_avg_win,
-            avg_loss=sample_avg_loss,
-            confidence=sample_confidence,
-            asset_tier=AssetTier.OPPORTUNITY,  # Max 20% for memecoins
-        )
-        
-        sizer = PositionSizer(params)
-        
+            foundation_sizer.calculate_position_quantity(entry_price)
+    
+    def test_tier_allocation_validation(self, opportunity_sizer):
+        """Test tier allocation limit validation (max 20% for memecoins)."""
         # Should allow position with low current exposure
-        assert sizer.validate_tier_allocation(Decimal("5.0"))
+        assert opportunity_sizer.validate_tier_allocation(Decimal("5.0"))
         
         # Should reject position with high current exposure
-        assert not sizer.validate_tier_allocation(Decimal("19.5"))
+        assert not opportunity_sizer.validate_tier_allocation(Decimal("19.5"))
     
+    @pytest.mark.slow
+    @_DECIMAL_PROPERTY_SETTINGS
     @given(
-        portfolio_value=st.decimals(min_value=1000, max_value=1000000, places=2),
-        entry_price=st.decimals(min_value=0.01, max_value=10000, places=2),
+        portfolio_value=_PORTFOLIO_STRAT,
+        entry_price=_ENTRY_STRAT,
     )
     def test_position_never_exceeds_portfolio(self, portfolio_value, entry_price):
         """Property test: Position size should never exceed portfolio value."""
         params = PositionSizeParams(
             portfolio_value=portfolio_value,
-            win_rate=Decimal("0.7"),  # Good win rate
-            avg_win=Decimal("100"),
-            avg_loss=Decimal("50"),
-            confidence=Decimal("0.9"),  # High confidence
+            win_rate=_WIN_RATE_70,  # Good win rate
+            avg_win=_D100,
+            avg_loss=_D50,
+            confidence=_CONF_90,  # High confidence
             asset_tier=AssetTier.FOUNDATION,
         )
         
         sizer = PositionSizer(params)
         position_size = sizer.calculate_position_size()
+        quantity = sizer.calculate_position_quantity(entry_price)
         
-        # Should never exceed portfolio
+        # Should never exceed portfolio, in dollars or in tokens bought at entry
         assert position_size <= portfolio_value
+        assert quantity * entry_price <= portfolio_value
 
 
 class TestRiskRewardRatio:
@@ -506,88 +378,77 @@ class TestRiskRewardRatio:
         
         # With entry=100, tp=120, sl=95:
         # Reward = 20, Risk = 5, RR = 4.0
-        assert rr_ratio == Decimal("4.0")
+        assert rr_ratio == _RR_4
     
-    def test_invalid_risk_reward_inputs(self, sample_entry_price):
+    @pytest.mark.parametrize("entry,take_profit,stop_loss,match", [
+        (_D100, Decimal("120"), Decimal("105"), "Stop loss must be below entry"),
+        (_D100, Decimal("95"), Decimal("90"), "Take profit must be above entry"),
+        (Decimal("0"), Decimal("120"), Decimal("90"), "Entry price must be positive"),
+        (Decimal("-100"), Decimal("120"), Decimal("90"), "Entry price must be positive"),
+    ], ids=["stop_above_entry", "take_profit_below_entry", "zero_entry", "negative_entry"])
+    def test_invalid_risk_reward_inputs(self, entry, take_profit, stop_loss, match):
         """Test that invalid inputs raise errors."""
-        # Stop loss above entry
-        with pytest.raises(ValueError, match="Stop loss must be below entry"):
-            calculate_risk_reward_ratio(
-                sample_entry_price,
-                Decimal("120"),
-                Decimal("105"),  # Above entry
-            )
-        
-        # Take profit below entry
-        with pytest.raises(ValueError, match="Take profit must be above entry"):
-            calculate_risk_reward_ratio(
-                sample_entry_price,
-                Decimal("95"),  # Below entry
-                Decimal("90"),
-            )
-        
-        # Zero entry price - covers line 248
-        with pytest.raises(ValueError, match="Entry price must be positive"):
-            calculate_risk_reward_ratio(
-                Decimal("0"),
-                Decimal("120"),
-                Decimal("90"),
-            )
-        
-        # Negative entry price
-        with pytest.raises(ValueError, match="Entry price must be positive"):
-            calculate_risk_reward_ratio(
-                Decimal("-100"),
-                Decimal("120"),
-                Decimal("90"),
-            )
+        with pytest.raises(ValueError, match=match):
+            calculate_risk_reward_ratio(entry, take_profit, stop_loss)
     
     def test_minimum_win_rate_calculation(self):
         """Test minimum win rate calculation for profitability."""
         # With 2:1 RR, need 33.3% win rate
-        min_wr = min_win_rate_for_profitability(Decimal("2.0"))
-        expected = Decimal("1") / Decimal("3")
-        assert abs(min_wr - expected) < Decimal("0.001")
+        min_wr = min_win_rate_for_profitability(_RR_2)
+        expected = _ONE / _RR_3
+        assert math.isclose(min_wr, expected, abs_tol=1e-9)
         
         # With 1:1 RR, need 50% win rate
-        min_wr = min_win_rate_for_profitability(Decimal("1.0"))
-        assert min_wr == Decimal("0.5")
+        min_wr = min_win_rate_for_profitability(_RR_1)
+        assert min_wr == _HALF
         
         # With 3:1 RR, need 25% win rate
-        min_wr = min_win_rate_for_profitability(Decimal("3.0"))
-        assert min_wr == Decimal("0.25")
+        min_wr = min_win_rate_for_profitability(_RR_3)
+        assert min_wr == _QUARTER
     
+    @pytest.mark.slow
+    @settings(_PROPERTY_SETTINGS, max_examples=20)  # Bulk check: test_position_sizing_vectorized.py
     @given(
-        entry=st.decimals(min_value=1, max_value=1000, places=2),
-        reward_pct=st.decimals(min_value=5, max_value=100, places=2),
-        risk_pct=st.decimals(min_value=1, max_value=20, places=2),
+        entry=_AMOUNT_STRAT,
+        reward_pct=_REWARD_PCT_STRAT,
+        risk_pct=_RISK_PCT_STRAT,
     )
     def test_risk_reward_always_positive(self, entry, reward_pct, risk_pct):
         """Property test: RR ratio should always be positive."""
-        tp = entry * (Decimal("1") + reward_pct / Decimal("100"))
-        sl = entry * (Decimal("1") - risk_pct / Decimal("100"))
+        tp = entry * (1 + reward_pct / 100)
+        sl = entry * (1 - risk_pct / 100)
         
         rr = calculate_risk_reward_ratio(entry, tp, sl)
         assert rr > 0
+        assert math.isclose(rr, _rr_from_pct(reward_pct, risk_pct), rel_tol=1e-9)
+    
+    @pytest.mark.parametrize("entry", [Decimal("1"), Decimal("100"), Decimal("999.99")])
+    def test_risk_reward_independent_of_entry(self, entry):
+        """Test RR depends only on the % distances to take profit and stop loss."""
+        reward_pct, risk_pct = Decimal("20"), Decimal("5")
+        tp = entry * (_ONE + reward_pct / _D100)
+        sl = entry * (_ONE - risk_pct / _D100)
+        
+        assert calculate_risk_reward_ratio(entry, tp, sl) == _rr_from_pct(reward_pct, risk_pct)
     
-    def test_zero_risk_reward_ratio(self):
+    def test_zero_risk_reward_ratio(self, number_type):
         """Test risk-reward ratio with zero risk (edge case)."""
-        entry = Decimal("100")
-        tp = Decimal("120")
-        sl = Decimal("100")  # No risk
+        entry = number_type("100")
+        tp = number_type("120")
+        sl = number_type("100")  # No risk
         
         # Should raise error for zero risk
         with pytest.raises(ValueError, match="Stop loss must be below entry"):
             calculate_risk_reward_ratio(entry, tp, sl)
     
-    def test_high_risk_reward_ratio(self):
+    def test_high_risk_reward_ratio(self, number_type):
         """Test very high risk-reward ratios."""
-        entry = Decimal("100")
-        tp = Decimal("200")  # 100% gain
-        sl = Decimal("99")   # 1% loss
+        entry = number_type("100")
+        tp = number_type("200")  # 100% gain
+        sl = number_type("99")   # 1% loss
         
         rr = calculate_risk_reward_ratio(entry, tp, sl)
-        assert rr == Decimal("100")  # 100:1 ratio
+        assert math.isclose(rr, 100, rel_tol=1e-9)  # 100:1 ratio
     
     def test_min_win_rate_zero_rr(self):
         """Test minimum win rate with zero RR (should handle edge case)."""
@@ -0,0 +1,166 @@
+"""Vectorized invariant sweeps for position sizing."""
+
+import math
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.risk.position_sizing import (
+    KellyCriterion,
+    PositionSizer,
+    PositionSizeParams,
+    calculate_risk_reward_ratio,
+)
+
+_N = 10_000
+_N_DECIMAL = 1_000  # Rows per sweep that go through the Decimal sizer
+_KELLY_FRACTION = float(KellyCriterion.KELLY_FRACTION)
+_MIN_WIN_RATE = float(KellyCriterion.MIN_WIN_RATE)
+
+
+@pytest.fixture
+def rng():
+    """Freshly seeded generator, so each sweep draws the same rows when run alone."""
+    return np.random.default_rng(20240115)
+
+
+def _kelly(win_rate, avg_win, avg_loss):
+    """Array form of KellyCriterion.calculate for positive average win and loss."""
+    win_loss_ratio = avg_win / avg_loss
+    kelly = (win_rate * win_loss_ratio - (1 - win_rate)) / win_loss_ratio
+    kelly = np.clip(kelly * _KELLY_FRACTION, 0.0, 1.0)
+    return np.where(win_rate < _MIN_WIN_RATE, 0.0, kelly)
+
+
+def _evaluate(func, *arrays):
+    """Call a production function row by row over the arrays and stack the results."""
+    return np.array([func(*row) for row in zip(*(a.tolist() for a in arrays))])
+
+
+def _sized_fraction(win_rate, avg_win, avg_loss, confidence, asset_tier):
+    """Position fraction from PositionSizer for one row of float inputs."""
+    params = PositionSizeParams(
+        portfolio_value=Decimal("1"),
+        win_rate=Decimal(win_rate),
+        avg_win=Decimal(avg_win),
+        avg_loss=Decimal(avg_loss),
+        confidence=Decimal(confidence),
+        asset_tier=asset_tier,
+    )
+    return float(PositionSizer(params).calculate_position_size())
+
+
+def _rr_ref(entry, take_profit, stop_loss):
+    """Closed-form array reference for calculate_risk_reward_ratio on valid inputs."""
+    return (take_profit - entry) / (entry - stop_loss)
+
+
+class TestKellySweep:
+    """Kelly invariants checked across a whole array of inputs at once."""
+    
+    def test_kelly_within_bounds(self, rng):
+        """Test Kelly stays within [0, 1] and matches the array formula for every input."""
+        win_rate = rng.uniform(0.51, 0.99, _N)
+        avg_win = rng.uniform(1, 1000, _N)
+        avg_loss = rng.uniform(1, 1000, _N)
+        
+        kelly = _evaluate(KellyCriterion.calculate, win_rate, avg_win, avg_loss)
+        
+        assert np.all((kelly >= 0) & (kelly <= 1))
+        assert np.allclose(kelly, _kelly(win_rate, avg_win, avg_loss), rtol=0, atol=1e-12)
+    
+    def test_kelly_zero_below_min_win_rate(self, rng):
+        """Test the minimum win rate gate across the full win rate range."""
+        win_rate = rng.uniform(0, 1, _N)
+        avg_win = rng.uniform(1, 1000, _N)
+        avg_loss = rng.uniform(1, 1000, _N)
+        below = win_rate < _MIN_WIN_RATE
+        
+        kelly = _evaluate(KellyCriterion.calculate, win_rate, avg_win, avg_loss)
+        
+        assert np.all(kelly[below] == 0)
+        assert np.all((kelly >= 0) & (kelly <= 1))
+        
+        # The Decimal path gates the same rows
+        for i in np.flatnonzero(below)[:_N_DECIMAL]:
+            assert KellyCriterion.calculate(
+                Decimal(win_rate[i]), Decimal(avg_win[i]), Decimal(avg_loss[i])
+            ) == 0
+    
+    def test_sweep_matches_calculate(self, rng):
+        """Test the array formula agrees with the Decimal Kelly path on a sample."""
+        win_rate = rng.uniform(0, 1, _N_DECIMAL)
+        avg_win = rng.uniform(1, 1000, _N_DECIMAL)
+        avg_loss = rng.uniform(1, 1000, _N_DECIMAL)
+        
+        kelly = _kelly(win_rate, avg_win, avg_loss)
+        
+        for i in range(_N_DECIMAL):
+            expected = KellyCriterion.calculate(
+                Decimal(win_rate[i]), Decimal(avg_win[i]), Decimal(avg_loss[i])
+            )
+            assert math.isclose(kelly[i], float(expected), abs_tol=1e-9)
+
+
+class TestPositionSizeSweep:
+    """Position size invariants checked across a whole array of inputs."""
+    
+    def test_position_fraction_never_exceeds_limits(self, rng):
+        """Test PositionSizer never exceeds the tier or hard caps and matches the formula."""
+        win_rate = rng.uniform(0.51, 0.99, _N_DECIMAL)
+        avg_win = rng.uniform(1, 1000, _N_DECIMAL)
+        avg_loss = rng.uniform(1, 1000, _N_DECIMAL)
+        confidence = rng.uniform(0, 1, _N_DECIMAL)
+        max_position_pct = 2.0
+        confidence_size = max_position_pct * (confidence * 0.5 + 0.5) / 100
+        
+        for tier, limit in PositionSizer.TIER_LIMITS.items():
+            tier_limit = float(limit) / 100
+            tiers = np.full(_N_DECIMAL, tier, dtype=object)
+            
+            # Unit portfolio, so the dollar size is the position fraction
+            fraction = _evaluate(
+                _sized_fraction, win_rate, avg_win, avg_loss, confidence, tiers
+            )
+            expected = np.minimum.reduce([
+                _kelly(win_rate, avg_win, avg_loss),
+                confidence_size,
+                np.full(_N_DECIMAL, tier_limit),
+                np.full(_N_DECIMAL, max_position_pct / 100),
+            ])
+            
+            assert np.all(fraction >= 0), tier
+            assert np.all(fraction <= min(tier_limit, max_position_pct / 100)), tier
+            assert np.allclose(fraction, expected, rtol=1e-9, atol=0), tier
+
+
+class TestRiskRewardSweep:
+    """Risk/reward invariants checked across a whole array of inputs."""
+    
+    def test_risk_reward_always_positive(self, rng):
+        """Test RR is positive and equals reward_pct / risk_pct for every input."""
+        entry = rng.uniform(1, 1000, _N)
+        reward_pct = rng.uniform(5, 100, _N)
+        risk_pct = rng.uniform(1, 20, _N)
+        
+        tp = entry * (1 + reward_pct / 100)
+        sl = entry * (1 - risk_pct / 100)
+        rr = _evaluate(calculate_risk_reward_ratio, entry, tp, sl)
+        
+        assert np.all(rr > 0)
+        assert np.allclose(rr, reward_pct / risk_pct)
+    
+    def test_reference_matches_decimal_implementation(self, rng):
+        """Test the array reference agrees with the Decimal implementation everywhere."""
+        entry = rng.uniform(1, 1000, _N)
+        tp = entry * rng.uniform(1.01, 3, _N)
+        sl = entry * rng.uniform(0.5, 0.99, _N)
+        
+        expected = _rr_ref(entry, tp, sl)
+        actual = np.array([
+            float(calculate_risk_reward_ratio(Decimal(e), Decimal(t), Decimal(s)))
+            for e, t, s in zip(entry.tolist(), tp.tolist(), sl.tolist())
+        ])
+        
+        assert np.allclose(actual, expected, rtol=1e-9, atol=0)